@@ -4,16 +4,41 @@ Claude Orchestra Dashboard - Web GUI for monitoring multi-agent pipeline
 """
 
 import os
+
+# Optional green-thread server: many WebSocket clients on one OS thread via epoll.
+# Monkey patching must run before threading/socket/subprocess are imported.
+ASYNC_MODE = os.getenv("ORCHESTRA_ASYNC_MODE", "").lower() or None
+try:
+    if ASYNC_MODE == 'eventlet':
+        import eventlet
+        eventlet.monkey_patch()
+    elif ASYNC_MODE == 'gevent':
+        from gevent import monkey
+        monkey.patch_all()
+except ImportError:
+    print(f"ORCHESTRA_ASYNC_MODE={ASYNC_MODE} requested but not installed; using threads")
+    ASYNC_MODE = 'threading'
+
 import json
 import re
+import ssl
+import stat
 import subprocess
 import threading
 import time
 import atexit
+import gzip
+import hashlib
+import functools
+import http.client
+from collections import deque
+from operator import itemgetter
 from datetime import datetime, timedelta
 from pathlib import Path
-from flask import Flask, render_template_string, jsonify, request
-from flask_socketio import SocketIO, emit
+from flask import Flask, Response, render_template_string, jsonify, request, session
+from flask.json.provider import DefaultJSONProvider
+from flask_socketio import SocketIO, emit, join_room, leave_room, rooms
+from werkzeug.serving import WSGIRequestHandler
 from process_manager import get_process_manager
 from queue_manager import get_queue
 
@@ -24,9 +49,80 @@ try:
 except ImportError:
     MULTIUSER_AVAILABLE = False
 
+# Try to use certifi for SSL certificates (needed on macOS)
+try:
+    import certifi
+    SSL_CONTEXT = ssl.create_default_context(cafile=certifi.where())
+except ImportError:
+    SSL_CONTEXT = ssl.create_default_context()
+
+# Optional C JSON codec for the output loop, HTTP responses and socket packets;
+# orjson.JSONDecodeError subclasses json.JSONDecodeError
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+# Optional Brotli copy of the dashboard page (smaller than gzip for browsers that accept br)
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Optional MessagePack framing for socket.io (smaller payloads, cheaper decode on the client)
+try:
+    import msgpack  # noqa: F401 - only needs to be importable for python-socketio
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+SOCKETIO_MSGPACK = MSGPACK_AVAILABLE and os.getenv("ORCHESTRA_SOCKETIO_MSGPACK", "false").lower() == "true"
+
+# Polling responses at or above this size are gzip/deflate compressed; WebSocket
+# frames use permessage-deflate, which the websocket server negotiates itself
+SOCKETIO_COMPRESSION_THRESHOLD = int(os.getenv("ORCHESTRA_SOCKETIO_COMPRESSION_THRESHOLD", "512"))
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, used by jsonify() and request.get_json()."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+class _OrjsonPacketJSON:
+    """json-module stand-in for socket.io packets (formatting kwargs are ignored)."""
+
+    @staticmethod
+    def dumps(obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    @staticmethod
+    def loads(s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'claude-orchestra-secret'
-socketio = SocketIO(app, cors_allowed_origins="*")
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+socketio = SocketIO(app, cors_allowed_origins="*",
+                    async_mode=ASYNC_MODE,
+                    json=_OrjsonPacketJSON if orjson is not None else json,
+                    serializer='msgpack' if SOCKETIO_MSGPACK else 'default',
+                    http_compression=True,
+                    compression_threshold=SOCKETIO_COMPRESSION_THRESHOLD)
 
 # Register multi-user handlers if available
 if MULTIUSER_AVAILABLE:
@@ -38,6 +134,9 @@ process_manager = get_process_manager()
 # Register cleanup on exit
 def cleanup_on_exit():
     """Clean up all processes when dashboard exits."""
+    orphan_cleanup_stop.set()
+    pr_scheduler_stop.set()
+    _pr_scheduler_wake.set()
     process_manager.stop_all_processes(timeout=5)
     orphan_count = process_manager.detect_and_kill_orphans()
     if orphan_count > 0:
@@ -45,6 +144,51 @@ def cleanup_on_exit():
 
 atexit.register(cleanup_on_exit)
 
+# Precompiled patterns for the TODO parser and the orchestra output loop
+# One pass over a whole TODO file: each match is an incomplete task or a priority section line
+_TODO_RE = re.compile(
+    r'^(?:[ \t]*[-*][ \t]*\[[ \t]*\][ \t]*(?P<task>.+)'
+    r'|.*?(?:(?P<priority>high|medium|low) priority|## (?P<heading>high|medium|low)).*)$',
+    re.IGNORECASE | re.MULTILINE
+)
+_TODO_PRIORITIES = ('high', 'medium', 'low')  # Checked in this order per line
+_BRANCH_RE = re.compile(r'(?:checkout -b|branch)\s+([^\s]+)')
+_TOOL_RE = re.compile(r'\[TOOL\]\s*(\w+)')
+
+# One pass over each output line for stage/cycle markers; m.lastindex says which matched:
+# 1 = "[STAGE n]", 2 = agent name (any case), 3 = "CYCLE n/", 4 = "Cycle ... complete"
+_STAGE_RE = re.compile(r'\[STAGE ([1-4])\]|(?i:(IMPLEMENTER|TESTER|REVIEWER|PLANNER))|CYCLE\s*(\d+)\s*/|(Cycle.*complete)')
+# Pipeline stages in run order; the page gets the same tuple for its stage list
+_STAGES = ('implement', 'test', 'review', 'plan')
+_STAGE_NAMES = {
+    '1': 'implement', 'IMPLEMENTER': 'implement',
+    '2': 'test', 'TESTER': 'test',
+    '3': 'review', 'REVIEWER': 'review',
+    '4': 'plan', 'PLANNER': 'plan',
+}
+# Common rate limit messages, combined so each output line is scanned once
+_RATE_LIMIT_RE = re.compile(
+    r'rate[ -]?limit|too many requests|429|try again in \d+|wait \d+ (?:second|minute|hour)|exceeded.*limit',
+    re.IGNORECASE
+)
+_RATE_LIMIT_WAIT_RE = re.compile(r'(\d+)\s*(second|minute|hour|sec|min|hr)', re.IGNORECASE)
+_GITHUB_REMOTE_RE = re.compile(r'github\.com[/:]([^/]+)/([^/\s]+?)(?:\.git)?$')
+
+# Log lines kept per project for replay to newly connected clients
+MAX_LOG_LINES = 500
+MAX_ACTIVITY_LOG = 500       # Activity entries kept per project
+ACTIVITY_LOG_SNAPSHOT = 20   # Most recent activity entries sent in a state snapshot (the page shows 20)
+MAX_USAGE_HISTORY = 1000     # Usage history entries kept
+MAX_SUMMARY_EVENTS = 500     # Summary events kept
+MAX_SAFEGUARD_ALERTS = 100   # Safeguard alerts kept
+MAX_TRACKED_FILES = 10000    # File fingerprints kept per project for files_changed dedup
+# PRs remembered per project (oldest dropped first)
+MAX_PRS_TRACKED = 200
+# Bytes requested per read of an orchestra's stdout pipe
+READ_CHUNK_SIZE = 65536
+# Raw lines buffered between the pipe reader and the parser before the oldest are dropped
+LINE_QUEUE_SIZE = 10000
+
 # Default state template for a project
 def create_project_state():
     return {
@@ -56,26 +200,39 @@ def create_project_state():
         "start_time": None,
         "max_hours": None,
         "cycles_completed": 0,
-        "prs_created": [],
-        "log_lines": [],
+        "prs_created": deque(maxlen=MAX_PRS_TRACKED),
+        "known_prs": set(),  # PR numbers already reported for this project
+        "log_lines": deque(maxlen=MAX_LOG_LINES),  # Ring buffer; oldest lines drop off in O(1)
+        "log_seq": 0,  # Number of lines ever appended; the last line in log_lines has this seq
         "process": None,
+        "stop_event": threading.Event(),  # Set on stop/exit; wakes the PR and orphan watchers
+        "_serialized_cache": None,  # Snapshot reused by get_serializable_state until invalidated
+        "_cache_dirty": True,
+        "_last_sent_snapshot": {},  # Snapshot as of the last state_diff broadcast
+        "_summary": None,  # This project's entry in get_all_projects_summary(), patched by set_state
+        "_summary_dirty": True,
         # Activity tracking
         "branches_created": 0,
         "current_branch": None,
         "files_changed": 0,
-        "files_changed_set": set(),  # Track unique files
+        "files_changed_fingerprints": {},  # hash(path) -> None, least recently edited first (dedup only)
         "last_file": None,
         "subagent_count": 0,
         "active_subagent": None,
         "subagents_used": [],  # Track all sub-agents used
         "tools_used": 0,
         "last_tool": None,
-        "activity_log": []  # Log of all activities
+        "lines_dropped": 0,  # Output lines discarded because the parser fell behind
+        "_last_activity_tuple": None,  # Activity counters as last emitted
+        "lock": threading.Lock(),  # Guards this project's snapshot; projects don't contend
+        "activity_log": deque(maxlen=MAX_ACTIVITY_LOG)  # (type, time, name, path, action) tuples, oldest evicted
     }
 
 # Global state - now supports multiple projects
 # Key: project_id (short name), Value: project state dict
 projects_state = {}
+# Held only while adding/removing projects; per-project state has its own "lock"
+_projects_lock = threading.Lock()
 
 # For backwards compatibility, also maintain single project reference
 orchestra_state = create_project_state()
@@ -92,7 +249,7 @@ usage_stats = {
     "last_reset_weekly": None,
     "rate_limited": False,
     "rate_limit_until": None,
-    "history": []  # [{timestamp, requests, tokens}, ...]
+    "history": deque(maxlen=MAX_USAGE_HISTORY)  # [{timestamp (epoch seconds), requests, tokens}, ...]
 }
 
 # Message queue - now file-based for cross-process communication
@@ -105,14 +262,14 @@ queue_counter = 0   # Deprecated - queue_manager handles this
 summary_data = {
     "hourly": {},  # {hour_key: {prs: n, tasks: n, files: n}}
     "daily": {},   # {date_key: {prs: n, tasks: n, files: n}}
-    "events": []   # [{timestamp, type, description, project_id}, ...]
+    "events": deque(maxlen=MAX_SUMMARY_EVENTS)   # [{timestamp, type, description, project_id}, ...]
 }
 
 # Safeguards configuration
 safeguards = {
     "subagent_timeout_minutes": 30,  # Max time for a sub-agent before warning
     "known_repos": [],  # List of known repo paths to detect cross-repo activity
-    "alerts": [],  # [{timestamp, type, message, project_id, severity}, ...]
+    "alerts": deque(maxlen=MAX_SAFEGUARD_ALERTS),  # [{timestamp, type, message, project_id, severity}, ...]
     "path_violations": [],  # [{timestamp, attempted_path, project_path, project_id}, ...]
 }
 
@@ -134,9 +291,6 @@ def add_safeguard_alert(alert_type, message, project_id=None, severity="warning"
         "severity": severity  # "info", "warning", "critical"
     }
     safeguards["alerts"].append(alert)
-    # Keep last 100 alerts
-    if len(safeguards["alerts"]) > 100:
-        safeguards["alerts"] = safeguards["alerts"][-100:]
     # Emit alert to dashboard
     socketio.emit('safeguard_alert', alert)
     # Also log to regular log
@@ -148,6 +302,23 @@ def check_path_traversal(file_path, project_path, project_id):
     if not file_path or not project_path:
         return False
 
+    # Fast path: an absolute path lexically under the project with no '..' parts
+    # stays inside it unless a component below the project root is a symlink.
+    # lstat those components only (stopping at the first that doesn't exist)
+    # instead of a full resolve(); any symlink falls through to resolve().
+    prefix = project_path.rstrip('/') + '/'
+    if file_path.startswith(prefix) and '/..' not in file_path:
+        current = prefix[:-1]
+        for part in file_path[len(prefix):].split('/'):
+            current = f'{current}/{part}'
+            try:
+                if stat.S_ISLNK(os.lstat(current).st_mode):
+                    break
+            except OSError:
+                return False  # Doesn't exist, so nothing below it can be a symlink
+        else:
+            return False
+
     try:
         # Resolve both paths to absolute
         file_abs = Path(file_path).resolve()
@@ -176,34 +347,53 @@ def check_path_traversal(file_path, project_path, project_id):
     except Exception:
         return False
 
+# Per-project cross-repo patterns, built once: path -> (project name, prefilter regex, [(repo name, patterns)])
+_cross_repo_patterns_cache = {}
+
+def _cross_repo_patterns(current_project_path):
+    """Lowercased suspicious patterns for every other known repo, plus a name prefilter."""
+    cached = _cross_repo_patterns_cache.get(current_project_path)
+    if cached is None:
+        current_project_name = os.path.basename(current_project_path.rstrip('/'))
+        entries = []
+        for repo_path in safeguards.get("known_repos", []):
+            repo_name = os.path.basename(repo_path)
+            if repo_name == current_project_name:
+                continue  # Skip current project
+
+            # Check for repo name mentions in suspicious contexts
+            suspicious_patterns = (
+                f"cd {repo_path}",
+                f"cd ~/{repo_name}",
+                f"cd /Users/{repo_name}",
+                f"{repo_path}/",
+                f"/{repo_name}/TODO",
+                f"/{repo_name}/src",
+                f"checkout {repo_name}",
+                f"project: {repo_name}",
+                f"in {repo_name}",
+            )
+            entries.append((repo_name, tuple(pattern.lower() for pattern in suspicious_patterns)))
+        # Every pattern contains its repo name, so lines naming no other repo can be skipped
+        names = '|'.join(re.escape(repo_name.lower()) for repo_name, _ in entries)
+        prefilter = re.compile(names) if names else None
+        cached = (current_project_name, prefilter, entries)
+        _cross_repo_patterns_cache[current_project_path] = cached
+    return cached
+
 def check_cross_repo_activity(line_text, current_project_path, project_id):
     """Check if output mentions other repos."""
     if not line_text or not current_project_path:
         return False
 
-    current_project_name = os.path.basename(current_project_path.rstrip('/'))
-
-    # Check for mentions of other known repos
-    for repo_path in safeguards.get("known_repos", []):
-        repo_name = os.path.basename(repo_path)
-        if repo_name == current_project_name:
-            continue  # Skip current project
-
-        # Check for repo name mentions in suspicious contexts
-        suspicious_patterns = [
-            f"cd {repo_path}",
-            f"cd ~/{repo_name}",
-            f"cd /Users/{repo_name}",
-            f"{repo_path}/",
-            f"/{repo_name}/TODO",
-            f"/{repo_name}/src",
-            f"checkout {repo_name}",
-            f"project: {repo_name}",
-            f"in {repo_name}",
-        ]
+    current_project_name, prefilter, entries = _cross_repo_patterns(current_project_path)
+    line_lower = line_text.lower()
+    if prefilter is None or not prefilter.search(line_lower):
+        return False
 
-        for pattern in suspicious_patterns:
-            if pattern.lower() in line_text.lower():
+    for repo_name, patterns in entries:
+        for pattern in patterns:
+            if pattern in line_lower:
                 add_safeguard_alert(
                     "cross_repo",
                     f"Possible cross-repo activity detected: mentions '{repo_name}' while working on '{current_project_name}'",
@@ -217,7 +407,7 @@ def check_cross_repo_activity(line_text, current_project_path, project_id):
 def get_safeguard_status():
     """Get current safeguard status for UI."""
     return {
-        "alerts": safeguards["alerts"][-20:],  # Last 20 alerts
+        "alerts": list(safeguards["alerts"])[-20:],  # Last 20 alerts
         "path_violations_count": len(safeguards["path_violations"]),
         "recent_violations": safeguards["path_violations"][-5:],
         "subagent_timeout_minutes": safeguards["subagent_timeout_minutes"]
@@ -226,29 +416,332 @@ def get_safeguard_status():
 # Initialize known repos on module load
 init_known_repos()
 
-def get_serializable_state(state=None):
-    """Return state dict without non-serializable objects (like Popen, set)."""
+# Keys never sent to clients (log_lines/log_seq are re-attached fresh for full snapshots)
+_STATE_PRIVATE_KEYS = ("process", "files_changed_fingerprints", "known_prs", "stop_event", "log_lines", "log_seq",
+                       "_serialized_cache", "_cache_dirty", "_last_sent_snapshot", "_summary", "_summary_dirty",
+                       "_last_activity_tuple", "lock")
+
+# Cached get_all_projects_summary() result; None when stale. The generation
+# bumps on every invalidation so a summary built concurrently isn't stored stale.
+_projects_summary_cache = None
+_projects_summary_generation = 0
+
+def invalidate_state_cache(state=None):
+    """Mark a project's serialized snapshot and the projects summary as stale."""
+    global _projects_summary_cache, _projects_summary_generation
+    if state is not None:
+        state["_cache_dirty"] = True
+        state["_summary_dirty"] = True
+    _projects_summary_generation += 1
+    _projects_summary_cache = None
+
+def set_state(state, **fields):
+    """Set plain fields on a project's state, patching its cached snapshot in place.
+
+    Cheaper than invalidate_state_cache() for scalar writes, since the next
+    emit reuses the snapshot and the project's summary entry instead of
+    rebuilding them.
+    """
+    with state["lock"]:
+        state.update(fields)
+        snapshot = state.get("_serialized_cache")
+        if snapshot is not None:
+            snapshot.update(fields)
+        summary = state["_summary"]
+        if summary is not None:
+            # The cached projects summary list holds this same dict, so it stays current too
+            for field, value in fields.items():
+                key = _SUMMARY_KEYS.get(field)
+                if key is not None:
+                    summary[key] = (value or '') if key == 'path' else value
+
+def get_serializable_state(state=None, include_logs=True):
+    """Return state dict without non-serializable objects (like Popen, set).
+
+    The snapshot is rebuilt only after invalidate_state_cache(). With
+    include_logs, a copy carrying the current log_lines and log_seq is
+    returned; without it the shared snapshot is returned as-is, for updates
+    whose new lines already went out in a batch_update.
+    """
     if state is None:
         state = orchestra_state
-    return {k: v for k, v in state.items() if k not in ("process", "files_changed_set")}
+    with state["lock"]:
+        serializable = state.get("_serialized_cache")
+        if serializable is None or state["_cache_dirty"]:
+            # Cleared before copying so an invalidation racing the copy isn't lost
+            state["_cache_dirty"] = False
+            serializable = {k: v for k, v in state.items() if k not in _STATE_PRIVATE_KEYS}
+            serializable["prs_created"] = list(state["prs_created"])
+            serializable["activity_log"] = [activity_entry_dict(entry, state["project_id"])
+                                            for entry in list(state["activity_log"])[-ACTIVITY_LOG_SNAPSHOT:]]
+            serializable["subagents_used"] = list(state["subagents_used"])
+            state["_serialized_cache"] = serializable
+        if include_logs:
+            return dict(serializable, log_lines=list(state["log_lines"]), log_seq=state["log_seq"])
+    return serializable
+
+def get_state_diff(state):
+    """Return the snapshot fields changed since the previous call, or None.
+
+    The result always carries project_id so clients can route it; they merge
+    it into the full snapshot they got on connect or project switch.
+    """
+    snapshot = get_serializable_state(state, include_logs=False)
+    with state["lock"]:
+        last = state["_last_sent_snapshot"]
+        diff = {k: v for k, v in snapshot.items() if k not in last or last[k] != v}
+        # Copied, since set_state() keeps patching the live snapshot
+        state["_last_sent_snapshot"] = dict(snapshot)
+    if not diff:
+        return None
+    diff["project_id"] = snapshot["project_id"]
+    return diff
+
+def append_log(state, project_id, text):
+    """Store a project's output line and queue it for the browser with its seq."""
+    with state["lock"]:
+        state["log_lines"].append(text)
+        state["log_seq"] += 1
+        # Queued under the lock so batches always carry seqs in order
+        emit_batcher.add_log(project_id, text, state["log_seq"])
+
+def activity_entry_dict(entry, project_id):
+    """Expand a stored activity tuple into the dict clients receive."""
+    kind, when, name, path, action = entry
+    item = {'type': kind, 'time': when, 'project_id': project_id}
+    if name is not None:
+        item['name'] = name
+    if path is not None:
+        item['path'] = path
+    if action is not None:
+        item['action'] = action
+    return item
+
+def record_activity(state, project_id, kind, name=None, path=None, action=None):
+    """Add an entry to a project's activity log and send it to clients.
+
+    Entries are stored as plain tuples; dicts are only built for the emit
+    and for the few entries a snapshot ships.
+    """
+    entry = (kind, datetime.now().isoformat(), name, path, action)
+    state["activity_log"].append(entry)
+    socketio.emit('activity_log_entry', activity_entry_dict(entry, project_id))
+
+# Summary fields pulled from a project state in one C-level call; every
+# create_project_state() dict has all of them
+_summary_fields = itemgetter('project_path', 'running', 'current_cycle', 'cycles_completed',
+                             'current_stage', 'prs_created', 'files_changed', 'subagent_count')
+# State fields set_state() can patch into a summary entry, and their summary keys
+_SUMMARY_KEYS = {'project_path': 'path', 'running': 'running', 'current_cycle': 'current_cycle',
+                 'cycles_completed': 'cycles_completed', 'current_stage': 'current_stage',
+                 'files_changed': 'files_changed', 'subagent_count': 'subagent_count'}
+
+def get_project_summary(project_id, state):
+    """Return a project's summary entry, rebuilding it only after invalidate_state_cache(state)."""
+    summary = state["_summary"]
+    if summary is None or state["_summary_dirty"]:
+        state["_summary_dirty"] = False  # Cleared first so a racing invalidation isn't lost
+        path, running, cycle, completed, stage, prs, files, subagents = _summary_fields(state)
+        summary = state["_summary"] = {
+            'id': project_id,
+            'path': path or '',
+            'running': running,
+            'current_cycle': cycle,
+            'cycles_completed': completed,
+            'current_stage': stage,
+            'prs_count': len(prs),
+            'files_changed': files,
+            'subagent_count': subagents
+        }
+    return summary
 
 def get_all_projects_summary():
     """Get summary of all running projects for the UI."""
-    summary = []
-    for project_id, state in projects_state.items():
-        summary.append({
-            'id': project_id,
-            'path': state.get('project_path', ''),
-            'running': state.get('running', False),
-            'current_cycle': state.get('current_cycle', 0),
-            'cycles_completed': state.get('cycles_completed', 0),
-            'current_stage': state.get('current_stage'),
-            'prs_count': len(state.get('prs_created', [])),
-            'files_changed': state.get('files_changed', 0),
-            'subagent_count': state.get('subagent_count', 0)
-        })
+    global _projects_summary_cache
+    if _projects_summary_cache is not None:
+        return _projects_summary_cache
+    generation = _projects_summary_generation
+    summary = [get_project_summary(project_id, state) for project_id, state in list(projects_state.items())]
+    if generation == _projects_summary_generation:
+        _projects_summary_cache = summary
     return summary
 
+def payload_version(*parts):
+    """Cheap change token for a payload, masked to fit exactly in a JS number."""
+    return hash(parts) & 0x1FFFFFFFFFFFFF
+
+class _EmitBatcher:
+    """Coalesce per-line socket emits into one flush every `interval` seconds.
+
+    Per-project events go only to that project's room (the clients viewing
+    it), so each update is serialized once per project rather than fanned
+    out to every tab. Everything pending for a project goes out in a single
+    `batch_update` frame. Its log lines are one list, so each line costs
+    one string rather than a dict; `seq` is the log_seq of the last line
+    so clients can drop lines they already have. The latest
+    activity/state/projects snapshots are sent at most once per flush no
+    matter how many lines arrived in between. Project state (`state`) and
+    activity stats (`activity`) hold only the fields that changed since
+    the last flush; log lines are never part of them since `log` carried
+    them. State and
+    projects updates are further throttled to one per `state_interval`;
+    changes inside that window go out with the next one, unless they were
+    marked urgent (a structural change the UI should show at once). A burst that queues
+    `max_lines` lines or `max_bytes` characters of log is flushed right away
+    instead of waiting out the interval, which bounds frame size.
+    """
+
+    def __init__(self, interval=0.1, state_interval=0.25, max_lines=128, max_bytes=65536):
+        self.interval = interval
+        self.state_interval = state_interval
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self._last_state_flush = 0.0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._full = threading.Event()  # Pending log hit max_lines/max_bytes; cuts the interval short
+        self._pending_logs = {}  # project_id -> [[line, ...], seq of last line]
+        self._pending_lines = 0
+        self._pending_bytes = 0
+        self._urgent = False  # A stage/cycle/sub-agent change is pending; skip the state throttle
+        self._activity = {}
+        self._sent_activity = {}  # project_id -> activity payload as last emitted
+        self._dirty_states = set()
+        self._projects_dirty = False
+        self._thread = None
+
+    def _schedule(self):
+        if self._thread is None:
+            # A background task rather than a raw thread, so it also works under eventlet/gevent
+            self._thread = socketio.start_background_task(self._run)
+        self._wake.set()
+
+    def add_log(self, pid, text, seq=None):
+        with self._lock:
+            pending = self._pending_logs.get(pid)
+            if pending is None:
+                self._pending_logs[pid] = pending = [[], None]
+            pending[0].append(text)
+            pending[1] = seq
+            self._pending_lines += 1
+            self._pending_bytes += len(text)
+            full = self._pending_lines >= self.max_lines or self._pending_bytes >= self.max_bytes
+        self._schedule()
+        if full:
+            self._full.set()
+
+    def set_activity(self, pid, activity):
+        with self._lock:
+            self._activity[pid] = activity
+        self._schedule()
+
+    def mark_state_dirty(self, pid, urgent=False):
+        with self._lock:
+            self._dirty_states.add(pid)
+            self._urgent = self._urgent or urgent
+        self._schedule()
+        if urgent:
+            self._full.set()
+
+    def mark_projects_dirty(self, urgent=False):
+        with self._lock:
+            self._projects_dirty = True
+            self._urgent = self._urgent or urgent
+        self._schedule()
+        if urgent:
+            self._full.set()
+
+    def flush(self, force=True):
+        """Emit what's pending: one batch_update frame per project, then projects_update.
+
+        A project's batch_update carries whichever of its log lines ('log'),
+        activity delta ('activity') and state diff ('state') are pending.
+        Unless forced, or marked urgent since the last flush, state/projects
+        updates wait until `state_interval` has passed since the last ones
+        were sent.
+        """
+        with self._lock:
+            logs, self._pending_logs = self._pending_logs, {}
+            self._pending_lines = self._pending_bytes = 0
+            activity, self._activity = self._activity, {}
+            now = time.monotonic()
+            if force or self._urgent or now - self._last_state_flush >= self.state_interval:
+                self._last_state_flush = now
+                self._urgent = False
+                dirty_states, self._dirty_states = self._dirty_states, set()
+                projects_dirty, self._projects_dirty = self._projects_dirty, False
+            else:
+                dirty_states, projects_dirty = (), False
+                if self._dirty_states or self._projects_dirty:
+                    self._wake.set()  # Trailing edge: send them on a later pass
+            activity_deltas = []
+            for pid, payload in activity.items():
+                last = self._sent_activity.get(pid, {})
+                delta = {k: v for k, v in payload.items() if k not in last or last[k] != v}
+                self._sent_activity[pid] = payload
+                if delta:
+                    delta['project_id'] = pid
+                    activity_deltas.append(delta)
+
+        updates = {}
+        for pid, (lines, seq) in logs.items():
+            updates.setdefault(pid, {'project_id': pid})['log'] = {'lines': lines, 'seq': seq}
+        for delta in activity_deltas:
+            pid = delta['project_id']
+            updates.setdefault(pid, {'project_id': pid})['activity'] = delta
+        for pid in dirty_states:
+            state = projects_state.get(pid)
+            diff = get_state_diff(state) if state is not None else None
+            if diff:
+                updates.setdefault(pid, {'project_id': pid})['state'] = diff
+        for pid, update in updates.items():
+            socketio.emit('batch_update', update, to=pid)
+        if projects_dirty:
+            socketio.emit('projects_update', {'projects': get_all_projects_summary()})
+
+    def _run(self):
+        # Sleeps on the event while idle, so there are no wakeups without output
+        while True:
+            self._wake.wait()
+            self._full.wait(self.interval)
+            self._full.clear()
+            self._wake.clear()
+            self.flush(force=False)
+
+emit_batcher = _EmitBatcher()
+
+ORPHAN_CLEANUP_INTERVAL = 60  # Seconds between orphan scans
+
+# One cleanup thread serves every project; started with the first orchestra run
+orphan_cleanup_stop = threading.Event()
+_orphan_cleanup_thread = None
+_orphan_cleanup_lock = threading.Lock()
+
+def cleanup_orphans():
+    """Periodically kill orphaned Claude processes in every running project's directory."""
+    while not orphan_cleanup_stop.wait(ORPHAN_CLEANUP_INTERVAL):
+        try:
+            running = {state["project_path"]: pid for pid, state in list(projects_state.items())
+                       if state.get("running") and state.get("project_path")}
+            # One scan of the process table for all projects
+            for path, orphan_count in process_manager.detect_and_kill_orphans_in(running).items():
+                project_id = running[path]
+                log_text = f'[{project_id}] ⚠️  Cleaned up {orphan_count} orphaned Claude process(es)'
+                state = projects_state.get(project_id)
+                if state is not None:
+                    append_log(state, project_id, log_text)
+        except Exception as e:
+            print(f"Error in orphan cleanup thread: {e}")
+
+def start_orphan_cleanup():
+    """Start the shared orphan cleanup thread if it isn't running yet."""
+    global _orphan_cleanup_thread
+    with _orphan_cleanup_lock:
+        if _orphan_cleanup_thread is None:
+            _orphan_cleanup_thread = threading.Thread(target=cleanup_orphans, daemon=True)
+            _orphan_cleanup_thread.start()
+
+@functools.lru_cache(maxsize=256)
 def get_project_id_from_path(path):
     """Generate a short project ID from path."""
     return os.path.basename(path.rstrip('/')) or 'project'
@@ -271,69 +764,69 @@ def reset_weekly_usage_if_needed():
         usage_stats["requests_this_week"] = 0
         usage_stats["last_reset_weekly"] = week_key
 
+# Epoch seconds of the next local midnight; days and weeks can only roll over there
+_next_usage_rollover = 0.0
+
+def reset_usage_if_needed():
+    """Run the daily/weekly resets, with a float compare instead of date formatting until midnight."""
+    global _next_usage_rollover
+    if time.time() < _next_usage_rollover:
+        return
+    reset_daily_usage_if_needed()
+    reset_weekly_usage_if_needed()
+    tomorrow = datetime.now() + timedelta(days=1)
+    _next_usage_rollover = tomorrow.replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+
 def track_api_request(tokens_estimate=1000):
     """Track an API request."""
     global usage_stats
-    reset_daily_usage_if_needed()
-    reset_weekly_usage_if_needed()
+    reset_usage_if_needed()
     usage_stats["requests_today"] += 1
     usage_stats["requests_this_week"] += 1
     usage_stats["tokens_estimated"] += tokens_estimate
     # Add to history
     usage_stats["history"].append({
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": time.time(),
         "requests": 1,
         "tokens": tokens_estimate
     })
-    # Keep last 1000 entries
-    if len(usage_stats["history"]) > 1000:
-        usage_stats["history"] = usage_stats["history"][-1000:]
     socketio.emit('usage_update', get_usage_stats())
 
 def get_usage_stats():
     """Get current usage stats for UI."""
-    reset_daily_usage_if_needed()
-    reset_weekly_usage_if_needed()
-    return {
+    reset_usage_if_needed()
+    stats = {
         "requests_today": usage_stats["requests_today"],
         "requests_this_week": usage_stats["requests_this_week"],
         "tokens_estimated": usage_stats["tokens_estimated"],
         "rate_limited": usage_stats["rate_limited"],
         "rate_limit_until": usage_stats["rate_limit_until"]
     }
+    stats["version"] = payload_version(*stats.values())
+    return stats
 
 def check_rate_limit(line):
     """Check if output indicates rate limiting. Returns seconds to wait or None."""
     global usage_stats
-    # Common rate limit patterns
-    rate_limit_patterns = [
-        r"rate limit|rate-limit|ratelimit",
-        r"too many requests",
-        r"429",
-        r"try again in (\d+)",
-        r"wait (\d+) (second|minute|hour)",
-        r"exceeded.*limit"
-    ]
-    line_lower = line.lower()
-    for pattern in rate_limit_patterns:
-        if re.search(pattern, line_lower):
-            # Try to extract wait time
-            time_match = re.search(r"(\d+)\s*(second|minute|hour|sec|min|hr)", line_lower)
-            if time_match:
-                amount = int(time_match.group(1))
-                unit = time_match.group(2)
-                if 'min' in unit:
-                    amount *= 60
-                elif 'hour' in unit or 'hr' in unit:
-                    amount *= 3600
-                usage_stats["rate_limited"] = True
-                usage_stats["rate_limit_until"] = (datetime.now() + timedelta(seconds=amount)).isoformat()
-                return amount
-            # Default 60 second wait if no time found
-            usage_stats["rate_limited"] = True
-            usage_stats["rate_limit_until"] = (datetime.now() + timedelta(seconds=60)).isoformat()
-            return 60
-    return None
+    # One case-insensitive pass over the line for every rate limit pattern
+    if not _RATE_LIMIT_RE.search(line):
+        return None
+    # Try to extract wait time
+    time_match = _RATE_LIMIT_WAIT_RE.search(line)
+    if time_match:
+        amount = int(time_match.group(1))
+        unit = time_match.group(2).lower()
+        if 'min' in unit:
+            amount *= 60
+        elif 'hour' in unit or 'hr' in unit:
+            amount *= 3600
+        usage_stats["rate_limited"] = True
+        usage_stats["rate_limit_until"] = (datetime.now() + timedelta(seconds=amount)).isoformat()
+        return amount
+    # Default 60 second wait if no time found
+    usage_stats["rate_limited"] = True
+    usage_stats["rate_limit_until"] = (datetime.now() + timedelta(seconds=60)).isoformat()
+    return 60
 
 def clear_rate_limit():
     """Clear rate limit status."""
@@ -351,13 +844,11 @@ def add_summary_event(event_type, description, project_id=None):
     # Add to events list
     summary_data["events"].append({
         "timestamp": now.isoformat(),
+        "time_str": now.strftime('%H:%M:%S'),  # Pre-formatted so clients don't re-parse per render
         "type": event_type,
         "description": description,
         "project_id": project_id
     })
-    # Keep last 500 events
-    if len(summary_data["events"]) > 500:
-        summary_data["events"] = summary_data["events"][-500:]
 
     # Update hourly/daily aggregates
     if hour_key not in summary_data["hourly"]:
@@ -392,9 +883,10 @@ def get_summary_stats(time_range='today'):
     else:
         cutoff = now - timedelta(days=30)  # Default to month
 
-    # Filter events by timestamp
+    # Filter events by timestamp. list() copies the deque in one C-level call, so
+    # add_summary_event() appending from an orchestra thread can't break the loop
     filtered_events = []
-    for event in summary_data["events"]:
+    for event in list(summary_data["events"]):
         try:
             event_time = datetime.fromisoformat(event.get("timestamp", ""))
             if event_time >= cutoff:
@@ -403,11 +895,21 @@ def get_summary_stats(time_range='today'):
             # Include events without valid timestamps
             filtered_events.append(event)
 
+    # Aggregates only change alongside events, so the event window identifies the payload
+    version = payload_version(
+        time_range,
+        len(filtered_events),
+        filtered_events[0].get("timestamp") if filtered_events else None,
+        filtered_events[-1].get("timestamp") if filtered_events else None,
+        len(summary_data["hourly"]),
+        len(summary_data["daily"])
+    )
     return {
         "hourly": summary_data["hourly"],
         "daily": summary_data["daily"],
         "recent_events": filtered_events[-50:],  # Last 50 filtered events
-        "time_range": time_range
+        "time_range": time_range,
+        "version": version
     }
 
 def add_to_queue(message, project_id=None, priority="normal"):
@@ -454,7 +956,11 @@ HTML_TEMPLATE = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Claude Orchestra Dashboard</title>
+    {% if socketio_msgpack %}
+    <script src="https://cdnjs.cloudflare.com/ajax/libs/socket.io/4.0.1/socket.io.msgpack.min.js"></script>
+    {% else %}
     <script src="https://cdnjs.cloudflare.com/ajax/libs/socket.io/4.0.1/socket.io.js"></script>
+    {% endif %}
     <style>
         * { box-sizing: border-box; margin: 0; padding: 0; }
         body {
@@ -536,6 +1042,9 @@ HTML_TEMPLATE = """
             line-height: 1.6;
             scroll-behavior: smooth;
         }
+        .log-sentinel {
+            height: 1px;
+        }
         .log-line {
             margin-bottom: 4px;
             word-wrap: break-word;
@@ -564,6 +1073,12 @@ HTML_TEMPLATE = """
             gap: 10px;
         }
         .pr-item:last-child { border-bottom: none; }
+        .subagent-item.active { background: #1f6feb20; }
+        .subagent-icon, .activity-icon { margin-right: 8px; }
+        .activity-text { font-size: 12px; }
+        .activity-type { color: #58a6ff; margin-right: 4px; }
+        .subagent-badge { display: none; color: #58a6ff; font-size: 10px; }
+        .subagent-item.active .subagent-badge { display: inline; }
         .pr-number {
             background: #238636;
             color: white;
@@ -875,6 +1390,8 @@ HTML_TEMPLATE = """
             font-size: 14px;
             color: #c9d1d9;
         }
+        .dir-name.muted { color: #8b949e; }
+        .dir-name.error { color: #f85149; }
         .modal-footer {
             padding: 16px 20px;
             border-top: 1px solid #30363d;
@@ -1119,7 +1636,7 @@ HTML_TEMPLATE = """
         }
         .queue-item .queue-status.pending { background: #d29922; }
         .queue-item .queue-status.processing { background: #238636; animation: pulse-dot 1s infinite; }
-        .queue-item .queue-text { flex: 1; font-size: 13px; color: #c9d1d9; }
+        .queue-item .queue-text { flex: 1; min-width: 0; font-size: 13px; color: #c9d1d9; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
         .queue-item .queue-remove { color: #8b949e; cursor: pointer; }
         .queue-item .queue-remove:hover { color: #f85149; }
         /* Summary/Master View */
@@ -1170,6 +1687,7 @@ HTML_TEMPLATE = """
             border-bottom: 1px solid #21262d;
         }
         .summary-event:last-child { border-bottom: none; }
+        .load-more { height: 1px; list-style: none; }
         .summary-event .event-time {
             font-size: 11px;
             color: #8b949e;
@@ -1262,7 +1780,7 @@ HTML_TEMPLATE = """
         .available-section h4 { font-size: 12px; color: #8b949e; margin-bottom: 10px; }
         .task-item { padding: 8px 10px; background: #0d1117; border: 1px solid #30363d; border-radius: 6px; margin-bottom: 6px; display: flex; align-items: center; gap: 8px; }
         .task-number { background: #30363d; color: #8b949e; padding: 2px 6px; border-radius: 4px; font-size: 10px; font-weight: 600; }
-        .task-title { flex: 1; font-size: 11px; color: #c9d1d9; overflow: hidden; text-overflow: ellipsis; white-space: nowrap; }
+        .task-title { flex: 1; min-width: 0; font-size: 11px; color: #c9d1d9; overflow: hidden; text-overflow: ellipsis; white-space: nowrap; }
         .task-labels { display: flex; gap: 4px; }
         .task-label { padding: 2px 5px; border-radius: 3px; font-size: 9px; font-weight: 500; }
         .task-label.high { background: #b6020530; color: #f85149; }
@@ -1608,25 +2126,192 @@ HTML_TEMPLATE = """
         </div>
     </div>
 
+    <!-- Empty-state markup, cloned by the list renderers -->
+    <template id="empty-msg-queue"><div style="color: #8b949e; text-align: center; padding: 10px; font-size: 12px;">No messages queued</div></template>
+    <template id="empty-events"><div style="color: #8b949e; text-align: center; padding: 20px;">No events yet</div></template>
+    <template id="empty-hourly"><div style="color: #8b949e; text-align: center; padding: 20px;">No hourly data yet</div></template>
+    <template id="empty-daily"><div style="color: #8b949e; text-align: center; padding: 20px;">No daily data yet</div></template>
+
     <script>
         const socket = io();
         let startTime = null;
         let maxSeconds = null;
         let timerInterval = null;
+        const STAGES = {{ stages | tojson }};  // Run order, from the server's _STAGES
+        const STAGE_ORDER = Object.create(null);  // Stage name -> index in STAGES
+        STAGES.forEach(function(s, idx) { STAGE_ORDER[s] = idx; });
+        const SUBAGENT_ICONS = {
+            'code-reviewer': '👀',
+            'test-automator': '🧪',
+            'debugger': '🔧',
+            'security-auditor': '🔒',
+            'Explore': '🔍',
+            'Plan': '📋',
+            'performance-engineer': '⚡',
+            'docs-architect': '📚',
+            'backend-architect': '🏗️',
+            'deployment-engineer': '🚀'
+        };
+        const MAX_LOG_LINES = 1000;  // Log lines kept in the page; older ones are dropped as new ones arrive
+
+        // Cached references to hot, long-lived elements (looked up once instead of on every update)
+        var $ = {
+            usageToday: document.getElementById('usageToday'),
+            queueCount: document.getElementById('queueCount'),
+            usageWeek: document.getElementById('usageWeek'),
+            usageTokens: document.getElementById('usageTokens'),
+            usageProgressFill: document.getElementById('usageProgressFill'),
+            rateLimitWarning: document.getElementById('rateLimitWarning'),
+            rateLimitCountdown: document.getElementById('rateLimitCountdown'),
+            messageQueueCount: document.getElementById('messageQueueCount'),
+            messageQueueList: document.getElementById('messageQueueList'),
+            summaryRequests: document.getElementById('summaryRequests'),
+            summaryTokens: document.getElementById('summaryTokens'),
+            summaryProjects: document.getElementById('summaryProjects'),
+            summaryAlerts: document.getElementById('summaryAlerts'),
+            summaryContent: document.getElementById('summaryContent'),
+            claimsList: document.getElementById('claims-list'),
+            claimsCount: document.getElementById('claims-count'),
+            availableTasksList: document.getElementById('available-tasks-list'),
+            availableCount: document.getElementById('available-count'),
+            multiuserStatus: document.getElementById('multiuser-status'),
+            multiuserContent: document.getElementById('multiuser-content'),
+            multiuserToggle: document.getElementById('multiuser-toggle'),
+            taskQueueSection: document.getElementsByClassName('task-queue-section')[0],
+            summaryTabs: document.getElementsByClassName('summary-tab'),
+            // Project view (written on every state/activity update)
+            statusBadge: document.getElementById('statusBadge'),
+            currentCycle: document.getElementById('currentCycle'),
+            cyclesCompleted: document.getElementById('cyclesCompleted'),
+            prsCreated: document.getElementById('prsCreated'),
+            startBtn: document.getElementById('startBtn'),
+            stopBtn: document.getElementById('stopBtn'),
+            projectPath: document.getElementById('projectPath'),
+            branchesCreated: document.getElementById('branchesCreated'),
+            currentBranch: document.getElementById('currentBranch'),
+            filesChanged: document.getElementById('filesChanged'),
+            lastFile: document.getElementById('lastFile'),
+            subAgentCount: document.getElementById('subAgentCount'),
+            activeSubAgent: document.getElementById('activeSubAgent'),
+            toolsUsed: document.getElementById('toolsUsed'),
+            lastTool: document.getElementById('lastTool'),
+            subagentsList: document.getElementById('subagentsList'),
+            activityLog: document.getElementById('activityLog'),
+            prList: document.getElementById('prList'),
+            logContent: document.getElementById('logContent'),
+            timeElapsed: document.getElementById('timeElapsed'),
+            timeRemaining: document.getElementById('timeRemaining'),
+            // Indexed like STAGES
+            stageItems: STAGES.map(function(s) { return document.getElementById('stage-' + s); }),
+            stageStatuses: STAGES.map(function(s) { return document.getElementById('status-' + s); })
+        };
+
+        // Pre-parsed empty-state nodes; cloned instead of rebuilt (and re-styled) on every render
+        const emptyQueueTpl = document.getElementById('empty-msg-queue').content.firstElementChild;
+        const emptyEventsTpl = document.getElementById('empty-events').content.firstElementChild;
+        const emptyHourlyTpl = document.getElementById('empty-hourly').content.firstElementChild;
+        const emptyDailyTpl = document.getElementById('empty-daily').content.firstElementChild;
+
+        // requestIdleCallback with a setTimeout fallback (Safari) that fakes a short idle deadline
+        var requestIdle = window.requestIdleCallback ? window.requestIdleCallback.bind(window) : function(fn) {
+            return setTimeout(function() {
+                var start = Date.now();
+                fn({ timeRemaining: function() { return Math.max(0, 8 - (Date.now() - start)); } });
+            }, 1);
+        };
+        var cancelIdle = window.cancelIdleCallback ? window.cancelIdleCallback.bind(window) : clearTimeout;
+
+        // Windowed list rendering: only the first page of rows is built; a .load-more sentinel
+        // at the end of the list pulls in the next page as it scrolls into view
+        var WINDOW_PAGE_SIZE = 10;
+
+        function stopWindowedRender(list) {
+            if (list._windowObserver) {
+                list._windowObserver.disconnect();
+                list._windowObserver = null;
+            }
+        }
+
+        function renderWindowed(list, total, appendRange, sentinelTag) {
+            stopWindowedRender(list);
+            var shown = Math.min(total, WINDOW_PAGE_SIZE);
+            appendRange(0, shown);
+            if (shown >= total) return;
+            if (!window.IntersectionObserver) {
+                appendRange(shown, total);
+                return;
+            }
+
+            var sentinel = document.createElement(sentinelTag || 'div');
+            sentinel.className = 'load-more';
+            list.appendChild(sentinel);
+            var observer = new IntersectionObserver(function(entries) {
+                if (!entries[entries.length - 1].isIntersecting) return;
+                var end = Math.min(total, shown + WINDOW_PAGE_SIZE);
+                observer.unobserve(sentinel);
+                sentinel.remove();
+                appendRange(shown, end);
+                shown = end;
+                if (shown >= total) {
+                    stopWindowedRender(list);
+                    return;
+                }
+                // Re-observing fires a fresh callback, so a still-visible sentinel keeps paging
+                list.appendChild(sentinel);
+                observer.observe(sentinel);
+            }, { root: list, rootMargin: '0px 0px 100px 0px' });
+            observer.observe(sentinel);
+            list._windowObserver = observer;
+        }
+
+        // The directory browser modal follows this script, so resolve it once parsing completes
+        document.addEventListener('DOMContentLoaded', function() {
+            $.dirList = document.getElementById('dirList');
+
+            // Delegated row click handlers - one listener per list instead of one closure per row
+            $.dirList.addEventListener('click', function(e) {
+                var item = e.target.closest('.dir-item');
+                if (item && item.dataset.path) navigateTo(item.dataset.path);
+            });
+            $.claimsList.addEventListener('click', function(e) {
+                var btn = e.target.closest('[data-action="release"]');
+                if (btn) releaseClaim(Number(btn.closest('.claim-item').dataset.issueNumber));
+            });
+            $.messageQueueList.addEventListener('click', function(e) {
+                var removeSpan = e.target.closest('.queue-remove');
+                if (removeSpan) removeFromQueue(Number(removeSpan.dataset.queueId));
+            });
+        });
 
         // Multi-project state
         let currentProjectId = 'new';
+        let currentProjectPath = null;  // Kept in step with currentProjectId; see getCurrentProjectPath
+        let currentState = null;  // Last full snapshot of the current project, kept current by state_diff
+        let logSeq = null;  // log_seq of the last line shown for the current project; null until a snapshot arrives
         let projectsData = {};
 
         // Pending projects (configured but not started yet)
         let pendingProjects = {};  // { pending_1: { path: '...', prompt: '...' }, ... }
         let pendingCounter = 0;
 
+        // The recent projects list doesn't need the socket, so it loads in parallel
+        // with the Socket.IO handshake instead of after it
+        var socketConnectedBefore = false;
+        loadRecentProjects();
+
         socket.on('connect', function() {
             console.log('Connected to server');
             socket.emit('get_state');
             socket.emit('get_all_projects');
-            loadRecentProjects();
+            if (projectsData[currentProjectId]) {
+                // Reconnected: lines may have been missed, so resync the open project
+                logSeq = null;
+                socket.emit('get_project_state', { project_id: currentProjectId });
+            }
+            if (socketConnectedBefore) {
+                loadRecentProjects();  // Refresh after a reconnect
+            }
+            socketConnectedBefore = true;
             // Create initial pending project if none exist
             if (Object.keys(pendingProjects).length === 0 && Object.keys(projectsData).length === 0) {
                 addNewPendingProject();
@@ -1643,6 +2328,9 @@ HTML_TEMPLATE = """
             if (currentProjectId === 'new') {
                 if (Object.keys(projectsData).length > 0) {
                     currentProjectId = Object.keys(projectsData)[0];
+                    currentProjectPath = projectsData[currentProjectId].path || null;
+                    // Also subscribes this tab to the project's updates
+                    socket.emit('get_project_state', { project_id: currentProjectId });
                 } else if (Object.keys(pendingProjects).length === 0) {
                     addNewPendingProject();
                     return;  // addNewPendingProject calls updateProjectTabs
@@ -1713,6 +2401,7 @@ HTML_TEMPLATE = """
             var newId = 'pending_' + pendingCounter;
             pendingProjects[newId] = { path: '', prompt: '', maxHours: '', maxCycles: '', model: 'sonnet' };
             currentProjectId = newId;
+            currentProjectPath = null;
             updateProjectTabs();
             // Show setup view for this pending project
             showPendingProjectSetup(newId);
@@ -1736,9 +2425,10 @@ HTML_TEMPLATE = """
         function showPendingProjectSetup(pendingId) {
             var pending = pendingProjects[pendingId];
             if (!pending) return;
+            currentProjectPath = pending.path || null;
 
             // Populate form with pending project data
-            document.getElementById('projectPath').value = pending.path || '';
+            $.projectPath.value = pending.path || '';
             document.getElementById('initialGuidance').value = pending.guidance || '';
             document.getElementById('maxHours').value = pending.maxHours || '1';
             document.getElementById('taskMode').value = pending.taskMode || 'normal';
@@ -1746,26 +2436,26 @@ HTML_TEMPLATE = """
                 document.getElementById('modelSelect').value = pending.model || 'sonnet';
             }
 
-            document.getElementById('startBtn').disabled = false;
-            document.getElementById('stopBtn').disabled = true;
-            document.getElementById('statusBadge').textContent = 'Setup';
-            document.getElementById('statusBadge').className = 'status-badge status-stopped';
+            $.startBtn.disabled = false;
+            $.stopBtn.disabled = true;
+            $.statusBadge.textContent = 'Setup';
+            $.statusBadge.className = 'status-badge status-stopped';
 
             // Clear the activity panels
-            document.getElementById('logContent').innerHTML = '<div class="log-line log-line-stage">Select a project folder and click "Start Orchestra" to begin</div>';
-            document.getElementById('activityLog').innerHTML = '<li class="pr-item" style="color: #8b949e;">No activity yet</li>';
-            document.getElementById('subagentsList').innerHTML = '<li class="pr-item" style="color: #8b949e;">None yet</li>';
-            document.getElementById('prList').innerHTML = '<li class="pr-item" style="color: #8b949e;">No PRs yet</li>';
+            $.logContent.innerHTML = '<div class="log-line log-line-stage">Select a project folder and click "Start Orchestra" to begin</div>';
+            $.activityLog.innerHTML = '<li class="pr-item" style="color: #8b949e;">No activity yet</li>';
+            $.subagentsList.innerHTML = '<li class="pr-item" style="color: #8b949e;">None yet</li>';
+            $.prList.innerHTML = '<li class="pr-item" style="color: #8b949e;">No PRs yet</li>';
 
             // Reset stats
-            document.getElementById('currentCycle').textContent = '0';
-            document.getElementById('cyclesCompleted').textContent = '0';
-            document.getElementById('prsCreated').textContent = '0';
-            document.getElementById('timeElapsed').textContent = '00:00';
-            document.getElementById('branchesCreated').textContent = '0';
-            document.getElementById('filesChanged').textContent = '0';
-            document.getElementById('subAgentCount').textContent = '0';
-            document.getElementById('toolsUsed').textContent = '0';
+            $.currentCycle.textContent = '0';
+            $.cyclesCompleted.textContent = '0';
+            $.prsCreated.textContent = '0';
+            $.timeElapsed.textContent = '00:00';
+            $.branchesCreated.textContent = '0';
+            $.filesChanged.textContent = '0';
+            $.subAgentCount.textContent = '0';
+            $.toolsUsed.textContent = '0';
 
             // Open browser for new empty projects
             if (!pending.path) {
@@ -1778,7 +2468,8 @@ HTML_TEMPLATE = """
             if (!currentProjectId || !currentProjectId.startsWith('pending_')) return;
             if (!pendingProjects[currentProjectId]) return;
 
-            pendingProjects[currentProjectId].path = document.getElementById('projectPath').value;
+            pendingProjects[currentProjectId].path = $.projectPath.value;
+            currentProjectPath = pendingProjects[currentProjectId].path;
             pendingProjects[currentProjectId].guidance = document.getElementById('initialGuidance').value;
             pendingProjects[currentProjectId].maxHours = document.getElementById('maxHours').value;
             pendingProjects[currentProjectId].taskMode = document.getElementById('taskMode').value;
@@ -1793,6 +2484,9 @@ HTML_TEMPLATE = """
         function selectProject(projectId) {
             console.log('selectProject called with:', projectId);
             currentProjectId = projectId;
+            currentState = null;
+            logSeq = null;
+            discardPendingUpdates();
             updateProjectTabs();
 
             if (projectId === 'new') {
@@ -1802,6 +2496,7 @@ HTML_TEMPLATE = """
                 // Show setup for pending project
                 showPendingProjectSetup(projectId);
             } else {
+                currentProjectPath = projectsData[projectId] ? projectsData[projectId].path : null;
                 // Load existing project state from server
                 socket.emit('get_project_state', { project_id: projectId });
             }
@@ -1828,10 +2523,39 @@ HTML_TEMPLATE = """
 
         socket.on('project_state', function(data) {
             if (data.project_id === currentProjectId) {
-                updateUI(data.state);
+                applyFullState(data.state);
             }
         });
 
+        // Changed fields only, from the server's emit batcher
+        function applyStateDiff(diff) {
+            if (!currentState || diff.project_id !== currentState.project_id || diff.project_id !== currentProjectId) {
+                return;  // Nothing to patch; the next project switch fetches a full snapshot
+            }
+            Object.assign(currentState, diff);
+            var state = currentState;
+            // Touch only the widgets whose fields are in the diff; the lists are rebuilt
+            // only when their own field changed
+            if ('running' in diff) renderRunning(state);
+            if ('current_cycle' in diff) $.currentCycle.textContent = state.current_cycle || 0;
+            if ('cycles_completed' in diff) $.cyclesCompleted.textContent = state.cycles_completed || 0;
+            if ('current_stage' in diff) renderStages(state);
+            if ('running' in diff || 'start_time' in diff || 'max_hours' in diff) renderTimerState(state);
+            if ('project_path' in diff && state.project_path) $.projectPath.value = state.project_path;
+            if ('prs_created' in diff) renderPRList(state.prs_created);
+            if ('activity_log' in diff) renderActivityLog(state.activity_log);
+            // Activity counters and the sub-agent list patch only the keys present
+            updateActivityStats(diff);
+        }
+
+        function applyFullState(state) {
+            updateUI(state);
+            // Keep everything but the log, which batch_update extends from here on
+            currentState = Object.assign({}, state);
+            delete currentState.log_lines;
+            delete currentState.log_seq;
+        }
+
         function loadRecentProjects() {
             fetch('/api/recent-projects')
                 .then(response => response.json())
@@ -1853,7 +2577,7 @@ HTML_TEMPLATE = """
         function selectRecentProject() {
             var select = document.getElementById('recentProjects');
             if (select.value) {
-                document.getElementById('projectPath').value = select.value;
+                $.projectPath.value = select.value;
                 // Auto-load TODOs for the selected project
                 loadTodos();
             }
@@ -1867,88 +2591,202 @@ HTML_TEMPLATE = """
                 if (currentProjectId === 'new' && state.project_id && state.running) {
                     return; // Don't update "new project" view with running project's updates
                 }
-                updateUI(state);
+                applyFullState(state);
             }
         });
 
         socket.on('log_line', function(data) {
             // Only add log line if it's for the current project or no project specified
             if (!data.project_id || data.project_id === currentProjectId) {
-                addLogLine(data.line);
+                queueLogLine(data.line);
             }
         });
 
-        socket.on('activity_update', function(data) {
-            // Only update if this is for the current project
+        // One frame per project per server flush: { project_id, log: { lines, seq }, activity: {...}, state: {...} },
+        // each part present only when it has something new
+        socket.on('batch_update', function(update) {
+            if (update.log) applyLogBatch(update.project_id, update.log);
+            if (update.activity) applyActivityDelta(update.activity);
+            if (update.state) applyStateDiff(update.state);
+        });
+
+        // seq is the log_seq of the batch's last line, so lines already in the last snapshot are skipped
+        function applyLogBatch(projectId, batch) {
+            if (projectId && projectId !== currentProjectId) return;
+            var lines = batch.lines;
+            var start = 0;
+            if (typeof batch.seq === 'number' && logSeq !== null) {
+                var firstSeq = batch.seq - lines.length + 1;
+                if (firstSeq > logSeq + 1) {
+                    // Missed lines in between; fetch a fresh snapshot instead
+                    logSeq = null;
+                    socket.emit('get_project_state', { project_id: projectId });
+                    return;
+                }
+                start = logSeq + 1 - firstSeq;
+            }
+            for (var i = Math.max(start, 0); i < lines.length; i++) {
+                queueLogLine(lines[i]);
+            }
+            if (typeof batch.seq === 'number' && logSeq !== null) logSeq = Math.max(logSeq, batch.seq);
+        }
+
+        // Only the activity fields that changed since the server's last flush
+        function applyActivityDelta(data) {
             if (!data.project_id || data.project_id === currentProjectId) {
-                updateActivityStats(data);
+                if (currentState && currentState.project_id === data.project_id) {
+                    Object.assign(currentState, data);
+                }
+                // Deltas arriving within one frame are merged and drawn together
+                pendingActivity = Object.assign(pendingActivity || {}, data);
+                scheduleUIFlush();
             }
-        });
+        }
+
+        // Socket handlers only queue log lines and activity stats; the DOM is
+        // written once per animation frame however many events arrived
+        var pendingLogLines = [];
+        var pendingActivity = null;
+        var uiFlushScheduled = false;
+
+        function queueLogLine(line) {
+            pendingLogLines.push(line);
+            // rAF doesn't fire in background tabs; keep only what the log panel can show
+            if (pendingLogLines.length > MAX_LOG_LINES) {
+                pendingLogLines.splice(0, pendingLogLines.length - MAX_LOG_LINES);
+            }
+            scheduleUIFlush();
+        }
 
+        function scheduleUIFlush() {
+            if (!uiFlushScheduled) {
+                uiFlushScheduled = true;
+                requestAnimationFrame(flushUI);
+            }
+        }
+
+        function flushUI() {
+            uiFlushScheduled = false;
+            if (pendingActivity) {
+                var activity = pendingActivity;
+                pendingActivity = null;
+                updateActivityStats(activity);
+            }
+            if (pendingLogLines.length > 0) {
+                var lines = pendingLogLines;
+                pendingLogLines = [];
+                appendLogLines(lines);
+            }
+        }
+
+        function discardPendingUpdates() {
+            // A fresh snapshot supersedes anything still queued
+            pendingLogLines = [];
+            pendingActivity = null;
+        }
+
+        // Patches only the fields present in `activity` (an activity delta, or several merged)
         function updateActivityStats(activity) {
             // Update branch stats
-            document.getElementById('branchesCreated').textContent = activity.branches_created || 0;
+            if ('branches_created' in activity) {
+                $.branchesCreated.textContent = activity.branches_created || 0;
+            }
             if (activity.current_branch) {
-                document.getElementById('currentBranch').textContent = activity.current_branch;
+                $.currentBranch.textContent = activity.current_branch;
             }
 
             // Update files stats
-            document.getElementById('filesChanged').textContent = activity.files_changed || 0;
+            if ('files_changed' in activity) {
+                $.filesChanged.textContent = activity.files_changed || 0;
+            }
             if (activity.last_file) {
                 // Show just the filename, not full path
                 var lastFile = activity.last_file.split('/').pop();
-                document.getElementById('lastFile').textContent = lastFile;
+                $.lastFile.textContent = lastFile;
             }
 
             // Update sub-agent stats
-            document.getElementById('subAgentCount').textContent = activity.subagent_count || 0;
-            if (activity.active_subagent) {
-                document.getElementById('activeSubAgent').textContent = activity.active_subagent;
-                document.getElementById('activeSubAgent').style.color = '#58a6ff';
-            } else {
-                document.getElementById('activeSubAgent').textContent = '-';
-                document.getElementById('activeSubAgent').style.color = '#8b949e';
+            if ('subagent_count' in activity) {
+                $.subAgentCount.textContent = activity.subagent_count || 0;
+            }
+            if ('active_subagent' in activity) {
+                if (activity.active_subagent) {
+                    $.activeSubAgent.textContent = activity.active_subagent;
+                    $.activeSubAgent.style.color = '#58a6ff';
+                } else {
+                    $.activeSubAgent.textContent = '-';
+                    $.activeSubAgent.style.color = '#8b949e';
+                }
             }
 
             // Update tool stats
-            document.getElementById('toolsUsed').textContent = activity.tools_used || 0;
+            if ('tools_used' in activity) {
+                $.toolsUsed.textContent = activity.tools_used || 0;
+            }
             if (activity.last_tool) {
-                document.getElementById('lastTool').textContent = activity.last_tool;
+                $.lastTool.textContent = activity.last_tool;
             }
 
-            // Update sub-agents list
+            // Update sub-agents list, only when it or the active agent changed
+            if (!('subagents_used' in activity) && !('active_subagent' in activity)) return;
+            if (currentState) activity = currentState;  // Delta may carry only one of the two
             if (activity.subagents_used && activity.subagents_used.length > 0) {
-                var subagentsList = document.getElementById('subagentsList');
-                subagentsList.innerHTML = '';
-                activity.subagents_used.forEach(function(agent) {
-                    var li = document.createElement('li');
-                    li.className = 'pr-item';
-                    var icon = getSubagentIcon(agent);
-                    li.innerHTML = '<span style="margin-right: 8px;">' + icon + '</span>' +
-                                   '<span class="pr-title">' + agent + '</span>';
-                    if (agent === activity.active_subagent) {
-                        li.style.background = '#1f6feb20';
-                        li.innerHTML += '<span style="color: #58a6ff; font-size: 10px;">ACTIVE</span>';
-                    }
-                    subagentsList.appendChild(li);
-                });
+                renderSubagents(activity.subagents_used, activity.active_subagent);
             }
         }
 
+        // Sub-agent name -> its <li>, so updates reuse nodes and only flip the active marker
+        var subagentNodes = new Map();
+
+        function renderSubagents(agents, active) {
+            var list = $.subagentsList;
+            var fragment = null;
+            var wanted = new Set(agents);
+            subagentNodes.forEach(function(li, agent) {
+                // Drop agents no longer listed, and nodes a list reset already removed
+                if (!wanted.has(agent) || li.parentNode !== list) {
+                    li.remove();
+                    subagentNodes.delete(agent);
+                }
+            });
+            agents.forEach(function(agent) {
+                var li = subagentNodes.get(agent);
+                if (!li) {
+                    li = createSubagentItem(agent);
+                    subagentNodes.set(agent, li);
+                    if (!fragment) fragment = document.createDocumentFragment();
+                    fragment.appendChild(li);
+                }
+                li.classList.toggle('active', agent === active);
+            });
+            if (fragment) {
+                if (subagentNodes.size === fragment.childNodes.length) {
+                    list.textContent = '';  // Only placeholder content left ("None yet")
+                }
+                list.appendChild(fragment);
+            }
+        }
+
+        function createSubagentItem(agent) {
+            var li = document.createElement('li');
+            li.className = 'pr-item subagent-item';
+            var icon = document.createElement('span');
+            icon.className = 'subagent-icon';
+            icon.textContent = getSubagentIcon(agent);
+            var name = document.createElement('span');
+            name.className = 'pr-title';
+            name.textContent = agent;
+            var badge = document.createElement('span');
+            badge.className = 'subagent-badge';
+            badge.textContent = 'ACTIVE';
+            li.appendChild(icon);
+            li.appendChild(name);
+            li.appendChild(badge);
+            return li;
+        }
+
         function getSubagentIcon(agentType) {
-            var icons = {
-                'code-reviewer': '👀',
-                'test-automator': '🧪',
-                'debugger': '🔧',
-                'security-auditor': '🔒',
-                'Explore': '🔍',
-                'Plan': '📋',
-                'performance-engineer': '⚡',
-                'docs-architect': '📚',
-                'backend-architect': '🏗️',
-                'deployment-engineer': '🚀'
-            };
-            return icons[agentType] || '🤖';
+            return SUBAGENT_ICONS[agentType] || '🤖';
         }
 
         socket.on('activity_log_entry', function(entry) {
@@ -1959,7 +2797,7 @@ HTML_TEMPLATE = """
         });
 
         function addActivityLogEntry(entry) {
-            var activityLog = document.getElementById('activityLog');
+            var activityLog = $.activityLog;
             if (activityLog.children.length === 1 && activityLog.children[0].textContent.indexOf('No activity') !== -1) {
                 activityLog.innerHTML = '';
             }
@@ -1983,8 +2821,13 @@ HTML_TEMPLATE = """
                 text = 'Sub-agent: ' + entry.name;
             }
 
-            li.innerHTML = '<span style="margin-right: 8px;">' + icon + '</span>' +
-                           '<span class="pr-title" style="font-size: 12px;">' + text + '</span>';
+            var iconSpan = document.createElement('span');
+            iconSpan.className = 'activity-icon';
+            iconSpan.textContent = icon;
+            var textSpan = document.createElement('span');
+            textSpan.className = 'pr-title activity-text';
+            textSpan.textContent = text;
+            li.append(iconSpan, textSpan);
             activityLog.insertBefore(li, activityLog.firstChild);
 
             // Keep only last 20 entries
@@ -1999,32 +2842,27 @@ HTML_TEMPLATE = """
             return num.toString();
         }
 
-        socket.on('pr_created', function(pr) {
-            addPR(pr);
+        // All PRs found by one server poll: { project_id, prs: [...] }
+        socket.on('prs_created_batch', function(data) {
+            if (!data.project_id || data.project_id === currentProjectId) {
+                addPRs(data.prs);
+            }
         });
 
-        function updateUI(state) {
-            document.getElementById('statusBadge').textContent = state.running ? 'Running' : 'Stopped';
-            document.getElementById('statusBadge').className = 'status-badge ' + (state.running ? 'status-running' : 'status-stopped');
-            document.getElementById('currentCycle').textContent = state.current_cycle || 0;
-            document.getElementById('cyclesCompleted').textContent = state.cycles_completed || 0;
-            document.getElementById('prsCreated').textContent = state.prs_created ? state.prs_created.length : 0;
-
-            document.getElementById('startBtn').disabled = state.running;
-            document.getElementById('stopBtn').disabled = !state.running;
-
-            if (state.project_path) {
-                document.getElementById('projectPath').value = state.project_path;
-            }
+        // Widget renderers shared by full snapshots (updateUI) and diffs (applyStateDiff)
+        function renderRunning(state) {
+            $.statusBadge.textContent = state.running ? 'Running' : 'Stopped';
+            $.statusBadge.className = 'status-badge ' + (state.running ? 'status-running' : 'status-stopped');
+            $.startBtn.disabled = state.running;
+            $.stopBtn.disabled = !state.running;
+        }
 
-            // Update stage highlights and statuses
-            var stages = ['implement', 'test', 'review', 'plan'];
-            var stageOrder = {'implement': 0, 'test': 1, 'review': 2, 'plan': 3};
-            var currentIdx = state.current_stage ? stageOrder[state.current_stage] : -1;
+        function renderStages(state) {
+            var currentIdx = state.current_stage in STAGE_ORDER ? STAGE_ORDER[state.current_stage] : -1;
 
-            stages.forEach(function(s, idx) {
-                var stageEl = document.getElementById('stage-' + s);
-                var statusEl = document.getElementById('status-' + s);
+            STAGES.forEach(function(s, idx) {
+                var stageEl = $.stageItems[idx];
+                var statusEl = $.stageStatuses[idx];
                 stageEl.className = 'stage-item';
 
                 if (state.current_stage === s) {
@@ -2041,7 +2879,9 @@ HTML_TEMPLATE = """
                     statusEl.className = 'stage-status';
                 }
             });
+        }
 
+        function renderTimerState(state) {
             if (state.running && state.start_time) {
                 startTime = new Date(state.start_time);
                 maxSeconds = state.max_hours ? state.max_hours * 3600 : null;
@@ -2054,71 +2894,81 @@ HTML_TEMPLATE = """
                     timerInterval = null;
                 }
             }
+        }
 
-            // Update PRs
-            if (state.prs_created && state.prs_created.length > 0) {
-                var prList = document.getElementById('prList');
-                prList.textContent = '';
-                state.prs_created.forEach(function(pr) { addPR(pr, false); });
+        function renderPRList(prs) {
+            $.prsCreated.textContent = prs ? prs.length : 0;
+            if (prs && prs.length > 0) {
+                var prFragment = document.createDocumentFragment();
+                prs.forEach(function(pr) { prFragment.appendChild(createPRItem(pr)); });
+                $.prList.textContent = '';
+                $.prList.appendChild(prFragment);
+            }
+        }
+
+        function renderActivityLog(entries) {
+            if (entries && entries.length > 0) {
+                $.activityLog.textContent = '';
+                // Oldest first, so the newest ends up on top as with live entries
+                entries.forEach(addActivityLogEntry);
+            }
+        }
+
+        function updateUI(state) {
+            renderRunning(state);
+            $.currentCycle.textContent = state.current_cycle || 0;
+            $.cyclesCompleted.textContent = state.cycles_completed || 0;
+
+            if (state.project_path) {
+                $.projectPath.value = state.project_path;
             }
 
-            // Restore log lines when switching projects
+            renderStages(state);
+            renderTimerState(state);
+            renderPRList(state.prs_created);
+
+            // Restore log lines when switching projects; only full snapshots carry them
+            if (state.log_seq !== undefined) {
+                logSeq = state.log_seq;
+            }
             if (state.log_lines && state.log_lines.length > 0) {
-                var logContent = document.getElementById('logContent');
-                logContent.innerHTML = '';
-                state.log_lines.forEach(function(line) {
-                    addLogLine(line);
-                });
+                discardPendingUpdates();
+                $.logContent.innerHTML = '';
+                logAtBottom = true;  // A restored log starts at its newest line
+                appendLogLines(state.log_lines);
             }
 
             // Restore activity stats
             if (state.branches_created !== undefined) {
-                document.getElementById('branchesCreated').textContent = state.branches_created || 0;
+                $.branchesCreated.textContent = state.branches_created || 0;
             }
             if (state.current_branch) {
-                document.getElementById('currentBranch').textContent = state.current_branch;
+                $.currentBranch.textContent = state.current_branch;
             }
             if (state.files_changed !== undefined) {
-                document.getElementById('filesChanged').textContent = state.files_changed || 0;
+                $.filesChanged.textContent = state.files_changed || 0;
             }
             if (state.last_file) {
-                document.getElementById('lastFile').textContent = state.last_file.split('/').pop();
+                $.lastFile.textContent = state.last_file.split('/').pop();
             }
             if (state.subagent_count !== undefined) {
-                document.getElementById('subAgentCount').textContent = state.subagent_count || 0;
+                $.subAgentCount.textContent = state.subagent_count || 0;
             }
             if (state.active_subagent) {
-                document.getElementById('activeSubAgent').textContent = state.active_subagent;
+                $.activeSubAgent.textContent = state.active_subagent;
             }
             if (state.tools_used !== undefined) {
-                document.getElementById('toolsUsed').textContent = state.tools_used || 0;
+                $.toolsUsed.textContent = state.tools_used || 0;
             }
             if (state.last_tool) {
-                document.getElementById('lastTool').textContent = state.last_tool;
+                $.lastTool.textContent = state.last_tool;
             }
 
-            // Restore activity log
-            if (state.activity_log && state.activity_log.length > 0) {
-                var activityLog = document.getElementById('activityLog');
-                activityLog.innerHTML = '';
-                state.activity_log.forEach(function(entry) {
-                    var li = document.createElement('li');
-                    li.className = 'pr-item';
-                    li.innerHTML = '<span style="color: #58a6ff;">' + entry.type + '</span> ' + entry.message;
-                    activityLog.appendChild(li);
-                });
-            }
+            renderActivityLog(state.activity_log);
 
             // Restore sub-agents list
             if (state.subagents_used && state.subagents_used.length > 0) {
-                var subagentsList = document.getElementById('subagentsList');
-                subagentsList.innerHTML = '';
-                state.subagents_used.forEach(function(agent) {
-                    var li = document.createElement('li');
-                    li.className = 'pr-item';
-                    li.textContent = agent;
-                    subagentsList.appendChild(li);
-                });
+                renderSubagents(state.subagents_used, state.active_subagent);
             }
         }
 
@@ -2130,24 +2980,64 @@ HTML_TEMPLATE = """
             var secs = elapsed % 60;
 
             if (hours > 0) {
-                document.getElementById('timeElapsed').textContent =
+                $.timeElapsed.textContent =
                     hours + ':' + String(mins).padStart(2, '0') + ':' + String(secs).padStart(2, '0');
             } else {
-                document.getElementById('timeElapsed').textContent =
+                $.timeElapsed.textContent =
                     String(mins).padStart(2, '0') + ':' + String(secs).padStart(2, '0');
             }
 
             if (maxSeconds) {
                 var remaining = Math.max(0, maxSeconds - elapsed);
                 var remMins = Math.floor(remaining / 60);
-                document.getElementById('timeRemaining').textContent = remMins + ' min remaining';
+                $.timeRemaining.textContent = remMins + ' min remaining';
             } else {
-                document.getElementById('timeRemaining').textContent = 'Running indefinitely';
+                $.timeRemaining.textContent = 'Running indefinitely';
+            }
+        }
+
+        // Autoscroll only while the end of the log is in view, so reading older
+        // output isn't interrupted; a sentinel after the last line reports it
+        var logAtBottom = true;
+        var logSentinel = document.createElement('div');
+        logSentinel.className = 'log-sentinel';
+        if ('IntersectionObserver' in window) {
+            new IntersectionObserver(function(entries) {
+                logAtBottom = entries[entries.length - 1].isIntersecting;
+            }, { root: $.logContent, rootMargin: '0px 0px 40px 0px' }).observe(logSentinel);
+        }
+
+        function appendLogLines(lines) {
+            var logContent = $.logContent;
+            // Only the newest lines are kept, so older ones in a big batch are never built
+            if (lines.length > MAX_LOG_LINES) lines = lines.slice(lines.length - MAX_LOG_LINES);
+            var fragment = document.createDocumentFragment();
+            var added = [];
+            for (var i = 0; i < lines.length; i++) {
+                var div = createLogLine(lines[i]);
+                fragment.appendChild(div);
+                added.push(div);
+            }
+            if (logSentinel.parentNode !== logContent) {
+                logContent.appendChild(logSentinel);  // Gone after the log was cleared
+            }
+            logContent.insertBefore(fragment, logSentinel);
+
+            // Limit visible log lines to prevent browser slowdown (the sentinel is one more element)
+            while (logContent.childElementCount > MAX_LOG_LINES + 1) {
+                logContent.removeChild(logContent.firstElementChild);
+            }
+            if (logAtBottom) {
+                logContent.scrollTop = logContent.scrollHeight;
             }
+
+            // Remove highlight class after animation
+            setTimeout(function() {
+                added.forEach(function(div) { div.classList.remove('new-line'); });
+            }, 1000);
         }
 
-        function addLogLine(line) {
-            var logContent = document.getElementById('logContent');
+        function createLogLine(line) {
             var div = document.createElement('div');
             div.className = 'log-line new-line';
 
@@ -2163,30 +3053,21 @@ HTML_TEMPLATE = """
             }
 
             div.textContent = line;
-            logContent.appendChild(div);
-
-            // Force scroll to bottom with a small delay for rendering
-            requestAnimationFrame(function() {
-                logContent.scrollTop = logContent.scrollHeight;
-            });
-
-            // Remove highlight class after animation
-            setTimeout(function() {
-                div.classList.remove('new-line');
-            }, 1000);
-
-            // Limit visible log lines to prevent browser slowdown (keep last 1000)
-            while (logContent.children.length > 1000) {
-                logContent.removeChild(logContent.firstChild);
-            }
+            return div;
         }
 
-        function addPR(pr, append) {
-            if (append === undefined) append = true;
-            var prList = document.getElementById('prList');
-            if (append && prList.children.length === 1 && prList.children[0].textContent.indexOf('No PRs') !== -1) {
+        function addPRs(prs) {
+            var prList = $.prList;
+            if (prList.children.length === 1 && prList.children[0].textContent.indexOf('No PRs') !== -1) {
                 prList.textContent = '';
             }
+            var fragment = document.createDocumentFragment();
+            prs.forEach(function(pr) { fragment.appendChild(createPRItem(pr)); });
+            prList.appendChild(fragment);
+            $.prsCreated.textContent = prList.children.length;
+        }
+
+        function createPRItem(pr) {
             var li = document.createElement('li');
             li.className = 'pr-item';
 
@@ -2207,14 +3088,15 @@ HTML_TEMPLATE = """
             li.appendChild(numSpan);
             li.appendChild(titleSpan);
             li.appendChild(link);
-            prList.appendChild(li);
-            document.getElementById('prsCreated').textContent = prList.children.length;
+            return li;
         }
 
         var loadedTasks = [];
+        var taskCheckboxes = [];  // Rendered checkboxes, index-aligned with loadedTasks
+        var selectedCount = 0;  // Checked entries in taskCheckboxes, kept in step by the change handlers
 
         function loadTodos() {
-            var projectPath = document.getElementById('projectPath').value;
+            var projectPath = $.projectPath.value;
             if (!projectPath) {
                 alert('Please enter a project path first');
                 return;
@@ -2223,7 +3105,10 @@ HTML_TEMPLATE = """
         }
 
         socket.on('todos_loaded', function(data) {
+            if (data.unchanged) return;  // Same TODO files as our last load; the rendered list is current
             loadedTasks = data.tasks;
+            taskCheckboxes = new Array(loadedTasks.length);
+            setSelectedCount(0);
             var taskList = document.getElementById('taskList');
             taskList.textContent = '';
 
@@ -2237,6 +3122,7 @@ HTML_TEMPLATE = """
                 return;
             }
 
+            var fragment = document.createDocumentFragment();
             loadedTasks.forEach(function(task, idx) {
                 var div = document.createElement('div');
                 div.className = 'task-item priority-' + task.priority;
@@ -2245,9 +3131,11 @@ HTML_TEMPLATE = """
                 var checkbox = document.createElement('input');
                 checkbox.type = 'checkbox';
                 checkbox.id = 'check-' + idx;
+                checkbox.dataset.idx = idx;
+                taskCheckboxes[idx] = checkbox;
                 checkbox.onchange = function() {
                     div.classList.toggle('selected', this.checked);
-                    updateQueueCount();
+                    setSelectedCount(selectedCount + (this.checked ? 1 : -1));
                 };
 
                 var label = document.createElement('label');
@@ -2256,45 +3144,47 @@ HTML_TEMPLATE = """
 
                 div.appendChild(checkbox);
                 div.appendChild(label);
-                taskList.appendChild(div);
+                fragment.appendChild(div);
             });
-            updateQueueCount();
+            taskList.appendChild(fragment);
         });
 
+        // Check or uncheck every task in one pass; the count follows directly
+        function setAllSelected(checked) {
+            for (var i = 0, n = taskCheckboxes.length; i < n; i++) {
+                var cb = taskCheckboxes[i];
+                cb.checked = checked;
+                cb.parentElement.classList.toggle('selected', checked);
+            }
+            setSelectedCount(checked ? taskCheckboxes.length : 0);
+        }
+
         function selectAll() {
-            document.querySelectorAll('#taskList input[type="checkbox"]').forEach(function(cb) {
-                cb.checked = true;
-                cb.parentElement.classList.add('selected');
-            });
-            updateQueueCount();
+            setAllSelected(true);
         }
 
         function clearSelection() {
-            document.querySelectorAll('#taskList input[type="checkbox"]').forEach(function(cb) {
-                cb.checked = false;
-                cb.parentElement.classList.remove('selected');
-            });
-            updateQueueCount();
+            setAllSelected(false);
         }
 
-        function updateQueueCount() {
-            var count = document.querySelectorAll('#taskList input[type="checkbox"]:checked').length;
-            document.getElementById('queueCount').textContent = count + ' selected';
+        function setSelectedCount(count) {
+            selectedCount = count;
+            $.queueCount.textContent = count + ' selected';
         }
 
         function getSelectedTasks() {
             var selected = [];
-            document.querySelectorAll('#taskList input[type="checkbox"]:checked').forEach(function(cb, idx) {
-                var taskIdx = parseInt(cb.id.replace('check-', ''));
-                if (loadedTasks[taskIdx]) {
-                    selected.push(loadedTasks[taskIdx].text);
+            for (var i = 0, n = taskCheckboxes.length; i < n; i++) {
+                var cb = taskCheckboxes[i];
+                if (cb.checked) {
+                    selected.push(loadedTasks[+cb.dataset.idx].text);
                 }
-            });
+            }
             return selected;
         }
 
         function startOrchestra() {
-            var projectPath = document.getElementById('projectPath').value;
+            var projectPath = $.projectPath.value;
             var maxHours = document.getElementById('maxHours').value;
             var taskMode = document.getElementById('taskMode').value;
             var model = document.getElementById('modelSelect').value;
@@ -2308,7 +3198,7 @@ HTML_TEMPLATE = """
             }
 
             // Generate project ID from path
-            var projectId = projectPath.split('/').filter(Boolean).pop() || 'project';
+            var projectId = pathBasename(projectPath) || 'project';
 
             // Remove from pending projects if this was a pending project
             if (currentProjectId && currentProjectId.startsWith('pending_')) {
@@ -2328,6 +3218,7 @@ HTML_TEMPLATE = """
 
             // Switch to this project tab
             currentProjectId = projectId;
+            currentProjectPath = projectPath;
             updateProjectTabs();
         }
 
@@ -2345,7 +3236,7 @@ HTML_TEMPLATE = """
                 modal.classList.add('active');
                 console.log('Added active class');
             }
-            var startPath = document.getElementById('projectPath').value || '/Users';
+            var startPath = $.projectPath.value || '/Users';
             navigateTo(startPath);
         }
 
@@ -2353,51 +3244,167 @@ HTML_TEMPLATE = """
             document.getElementById('dirBrowserModal').classList.remove('active');
         }
 
-        function navigateTo(path) {
-            document.getElementById('currentPath').value = path;
-            document.getElementById('dirList').innerHTML = '<div class="dir-item"><span class="dir-name" style="color: #8b949e;">Loading...</span></div>';
+        // Row template for the directory browser, cloned per entry instead of re-parsing innerHTML
+        var dirItemTpl = document.createElement('template');
+        dirItemTpl.innerHTML = '<div class="dir-item"><span class="dir-icon">📁</span><span class="dir-name"></span></div>';
 
-            fetch('/api/list-dirs?path=' + encodeURIComponent(path))
-                .then(response => response.json())
-                .then(data => {
-                    var dirList = document.getElementById('dirList');
-                    dirList.innerHTML = '';
+        function createDirItem(name, targetPath) {
+            var node = dirItemTpl.content.firstElementChild.cloneNode(true);
+            node.lastElementChild.textContent = name;
+            node.dataset.path = targetPath;  // Handled by the delegated click listener on dirList
+            return node;
+        }
 
-                    if (data.error) {
-                        dirList.innerHTML = '<div class="dir-item"><span class="dir-name" style="color: #f85149;">' + data.error + '</span></div>';
-                        return;
-                    }
+        // Directory listings cache (stale-while-revalidate): path -> { data, timestamp }
+        var DIR_CACHE_TTL_MS = 60000;
+        var DIR_PREFETCH_LIMIT = 20;
+        var dirCache = new Map();
+        var browsePath = null;  // Path currently shown in the browser
 
-                    // Add parent directory option
-                    if (path !== '/') {
-                        var parentDiv = document.createElement('div');
-                        parentDiv.className = 'dir-item';
-                        parentDiv.innerHTML = '<span class="dir-icon">📁</span><span class="dir-name">..</span>';
-                        parentDiv.onclick = function() {
-                            var parts = path.split('/').filter(p => p);
-                            parts.pop();
-                            navigateTo('/' + parts.join('/'));
-                        };
-                        dirList.appendChild(parentDiv);
-                    }
+        function joinDirPath(path, dir) {
+            return path + (path.endsWith('/') ? '' : '/') + dir;
+        }
 
-                    // Add directories - single click navigates into folder
-                    (data.dirs || []).forEach(function(dir) {
-                        var div = document.createElement('div');
-                        div.className = 'dir-item';
-                        div.innerHTML = '<span class="dir-icon">📁</span><span class="dir-name">' + dir + '</span>';
-                        div.onclick = function() {
-                            navigateTo(path + (path.endsWith('/') ? '' : '/') + dir);
-                        };
-                        dirList.appendChild(div);
-                    });
+        // Memoized path segments (LRU, insertion order of the Map doubles as recency order).
+        // Cached arrays are frozen - use pathBasename/pathParent rather than pop()/slice-in-place.
+        var PATH_PARTS_CACHE_SIZE = 128;
+        var pathPartsCache = new Map();
+
+        function pathParts(path) {
+            var parts = pathPartsCache.get(path);
+            if (parts) {
+                pathPartsCache.delete(path);
+            } else {
+                parts = Object.freeze(path.split('/').filter(Boolean));
+                if (pathPartsCache.size >= PATH_PARTS_CACHE_SIZE) {
+                    pathPartsCache.delete(pathPartsCache.keys().next().value);
+                }
+            }
+            pathPartsCache.set(path, parts);
+            return parts;
+        }
+
+        function pathBasename(path) {
+            var parts = pathParts(path);
+            return parts[parts.length - 1];
+        }
+
+        function pathParent(path) {
+            return '/' + pathParts(path).slice(0, -1).join('/');
+        }
+
+        function isDirCacheFresh(path) {
+            var cached = dirCache.get(path);
+            return cached && (Date.now() - cached.timestamp) < DIR_CACHE_TTL_MS;
+        }
+
+        // List one directory over the open socket (acknowledged reply), falling back to HTTP while disconnected
+        function requestDirListing(path) {
+            if (!socket.connected) {
+                return fetch('/api/list-dirs?path=' + encodeURIComponent(path)).then(response => response.json());
+            }
+            return new Promise(function(resolve) {
+                socket.emit('list_dirs', { path: path }, resolve);
+            });
+        }
 
-                    if ((data.dirs || []).length === 0 && path !== '/') {
-                        dirList.innerHTML += '<div class="dir-item"><span class="dir-name" style="color: #8b949e;">No subdirectories</span></div>';
+        function fetchDirListing(path) {
+            return requestDirListing(path)
+                .then(data => {
+                    if (!data.error) {
+                        dirCache.set(path, { data: data, timestamp: Date.now() });
                     }
+                    return data;
+                });
+        }
+
+        // Warm the cache for the children of a listing in one batched request during idle time
+        function prefetchChildDirs(path, dirs) {
+            var paths = (dirs || []).map(function(dir) { return joinDirPath(path, dir); })
+                .filter(function(p) { return !isDirCacheFresh(p); })
+                .slice(0, DIR_PREFETCH_LIMIT);
+            if (paths.length === 0) return;
+
+            requestIdle(function() {
+                fetch('/api/list-dirs-batch', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ paths: paths })
+                })
+                    .then(response => response.json())
+                    .then(data => {
+                        var now = Date.now();
+                        Object.keys(data.results || {}).forEach(function(p) {
+                            if (!data.results[p].error) {
+                                dirCache.set(p, { data: data.results[p], timestamp: now });
+                            }
+                        });
+                    })
+                    .catch(err => console.log('Could not prefetch directories:', err));
+            });
+        }
+
+        // Placeholder row (loading/empty/error); kind is 'muted' or 'error'
+        function createDirMessage(text, kind) {
+            var div = document.createElement('div');
+            div.className = 'dir-item';
+            var name = document.createElement('span');
+            name.className = 'dir-name ' + kind;
+            name.textContent = text;
+            div.appendChild(name);
+            return div;
+        }
+
+        function renderDirListing(path, data) {
+            if (data.error) {
+                $.dirList.replaceChildren(createDirMessage(data.error, 'error'));
+                return;
+            }
+
+            // Build the whole listing off-document and swap it in with a single reflow
+            var frag = document.createDocumentFragment();
+
+            // Add parent directory option
+            if (path !== '/') {
+                frag.appendChild(createDirItem('..', pathParent(path)));
+            }
+
+            // Add directories - single click navigates into folder
+            (data.dirs || []).forEach(function(dir) {
+                frag.appendChild(createDirItem(dir, joinDirPath(path, dir)));
+            });
+
+            if ((data.dirs || []).length === 0 && path !== '/') {
+                frag.appendChild(createDirMessage('No subdirectories', 'muted'));
+            }
+
+            $.dirList.replaceChildren(frag);
+        }
+
+        function navigateTo(path) {
+            document.getElementById('currentPath').value = path;
+            browsePath = path;
+
+            var cached = dirCache.get(path);
+            if (cached) {
+                // Render immediately from cache; revalidate in the background once stale
+                renderDirListing(path, cached.data);
+                prefetchChildDirs(path, cached.data.dirs);
+                if (isDirCacheFresh(path)) return;
+            } else {
+                $.dirList.replaceChildren(createDirMessage('Loading...', 'muted'));
+            }
+
+            fetchDirListing(path)
+                .then(data => {
+                    // Ignore responses for a directory the user has already left
+                    if (browsePath !== path) return;
+                    renderDirListing(path, data);
+                    if (!cached) prefetchChildDirs(path, data.dirs);
                 })
                 .catch(err => {
-                    document.getElementById('dirList').innerHTML = '<div class="dir-item"><span class="dir-name" style="color: #f85149;">Error loading directory</span></div>';
+                    if (browsePath !== path || cached) return;
+                    $.dirList.replaceChildren(createDirMessage('Error loading directory', 'error'));
                 });
         }
 
@@ -2409,10 +3416,11 @@ HTML_TEMPLATE = """
 
         function selectCurrentDir() {
             var path = document.getElementById('currentPath').value;
-            document.getElementById('projectPath').value = path;
+            $.projectPath.value = path;
             // Save to pending project if applicable
             if (currentProjectId && currentProjectId.startsWith('pending_') && pendingProjects[currentProjectId]) {
                 pendingProjects[currentProjectId].path = path;
+                currentProjectPath = path;
                 updateProjectTabs();  // Update tab name to show folder name
             }
             closeBrowser();
@@ -2434,7 +3442,19 @@ HTML_TEMPLATE = """
             socket.emit('get_summary');
         }, 500);
 
+        // Last payload versions seen; unchanged polls are dropped before touching the DOM
+        var lastUsageVersion = null;
+        var lastSummaryVersion = null;
+        var lastClaimsVersion = null;
+        var lastSummaryData = null;
+
+        function isSameVersion(data, lastVersion) {
+            return data.version !== undefined && data.version === lastVersion;
+        }
+
         socket.on('usage_update', function(data) {
+            if (isSameVersion(data, lastUsageVersion)) return;
+            lastUsageVersion = data.version;
             updateUsageUI(data);
         });
 
@@ -2443,13 +3463,13 @@ HTML_TEMPLATE = """
             var week = data.requests_this_week || 0;
             var tokens = data.tokens_estimated || 0;
 
-            document.getElementById('usageToday').textContent = today + '/' + DAILY_LIMIT;
-            document.getElementById('usageWeek').textContent = week + '/' + WEEKLY_LIMIT;
-            document.getElementById('usageTokens').textContent = formatNumber(tokens);
+            $.usageToday.textContent = today + '/' + DAILY_LIMIT;
+            $.usageWeek.textContent = week + '/' + WEEKLY_LIMIT;
+            $.usageTokens.textContent = formatNumber(tokens);
 
             // Update progress bar
             var percentage = Math.min((today / DAILY_LIMIT) * 100, 100);
-            var progressFill = document.getElementById('usageProgressFill');
+            var progressFill = $.usageProgressFill;
             progressFill.style.width = percentage + '%';
             progressFill.className = 'usage-progress-fill';
             if (percentage >= 90) {
@@ -2467,7 +3487,7 @@ HTML_TEMPLATE = """
         }
 
         function showRateLimitWarning(untilTime) {
-            var warning = document.getElementById('rateLimitWarning');
+            var warning = $.rateLimitWarning;
             warning.classList.add('active');
 
             if (rateLimitInterval) clearInterval(rateLimitInterval);
@@ -2484,13 +3504,13 @@ HTML_TEMPLATE = """
 
                 var mins = Math.floor(remaining / 60000);
                 var secs = Math.floor((remaining % 60000) / 1000);
-                document.getElementById('rateLimitCountdown').textContent =
+                $.rateLimitCountdown.textContent =
                     String(mins).padStart(2, '0') + ':' + String(secs).padStart(2, '0');
             }, 1000);
         }
 
         function hideRateLimitWarning() {
-            document.getElementById('rateLimitWarning').classList.remove('active');
+            $.rateLimitWarning.classList.remove('active');
             if (rateLimitInterval) {
                 clearInterval(rateLimitInterval);
                 rateLimitInterval = null;
@@ -2510,43 +3530,46 @@ HTML_TEMPLATE = """
 
         function updateMessageQueueUI(data) {
             var queue = data.queue || [];
-            document.getElementById('messageQueueCount').textContent = queue.length;
+            $.messageQueueCount.textContent = queue.length;
 
-            var queueList = document.getElementById('messageQueueList');
-            // Clear using DOM methods
-            while (queueList.firstChild) {
-                queueList.removeChild(queueList.firstChild);
-            }
+            var queueList = $.messageQueueList;
+            stopWindowedRender(queueList);
 
             if (queue.length === 0) {
-                var emptyMsg = document.createElement('div');
-                emptyMsg.style.cssText = 'color: #8b949e; text-align: center; padding: 10px; font-size: 12px;';
-                emptyMsg.textContent = 'No messages queued';
-                queueList.appendChild(emptyMsg);
+                queueList.replaceChildren(emptyQueueTpl.cloneNode(true));
                 return;
             }
+            queueList.replaceChildren();
 
-            queue.forEach(function(item) {
-                var div = document.createElement('div');
-                div.className = 'queue-item';
+            renderWindowed(queueList, queue.length, function(start, end) {
+                var frag = document.createDocumentFragment();
+                for (var k = start; k < end; k++) {
+                    frag.appendChild(createQueueRow(queue[k]));
+                }
+                queueList.appendChild(frag);
+            });
+        }
+
+        function createQueueRow(item) {
+            var div = document.createElement('div');
+            div.className = 'queue-item';
 
-                var statusSpan = document.createElement('span');
-                statusSpan.className = 'queue-status ' + item.status;
+            var statusSpan = document.createElement('span');
+            statusSpan.className = 'queue-status ' + item.status;
 
-                var textSpan = document.createElement('span');
-                textSpan.className = 'queue-text';
-                textSpan.textContent = item.message.substring(0, 100) + (item.message.length > 100 ? '...' : '');
+            var textSpan = document.createElement('span');
+            textSpan.className = 'queue-text';
+            textSpan.textContent = item.message;  // Truncated by CSS (text-overflow: ellipsis)
 
-                var removeSpan = document.createElement('span');
-                removeSpan.className = 'queue-remove';
-                removeSpan.textContent = '×';
-                removeSpan.onclick = function() { removeFromQueue(item.id); };
+            var removeSpan = document.createElement('span');
+            removeSpan.className = 'queue-remove';
+            removeSpan.textContent = '×';
+            removeSpan.dataset.queueId = item.id;
 
-                div.appendChild(statusSpan);
-                div.appendChild(textSpan);
-                div.appendChild(removeSpan);
-                queueList.appendChild(div);
-            });
+            div.appendChild(statusSpan);
+            div.appendChild(textSpan);
+            div.appendChild(removeSpan);
+            return div;
         }
 
         function addToMessageQueue() {
@@ -2572,134 +3595,161 @@ HTML_TEMPLATE = """
         // Summary/Master View Handling
         // ============================================
         socket.on('summary_update', function(data) {
+            $.summaryProjects.textContent = Object.keys(projectsData).length;
+            if (isSameVersion(data, lastSummaryVersion)) return;
+            lastSummaryVersion = data.version;
+            lastSummaryData = data;
             updateSummaryUI(data);
         });
 
         function updateSummaryUI(data) {
-            document.getElementById('summaryRequests').textContent = data.total_requests || 0;
-            document.getElementById('summaryTokens').textContent = formatNumber(data.total_tokens || 0);
-            document.getElementById('summaryProjects').textContent = Object.keys(projectsData).length;
-            document.getElementById('summaryAlerts').textContent = data.alerts || 0;
+            $.summaryRequests.textContent = data.total_requests || 0;
+            $.summaryTokens.textContent = formatNumber(data.total_tokens || 0);
+            $.summaryProjects.textContent = Object.keys(projectsData).length;
+            $.summaryAlerts.textContent = data.alerts || 0;
             renderSummaryContent(data);
         }
 
         function switchSummaryTab(tab) {
             currentSummaryTab = tab;
-            document.querySelectorAll('.summary-tab').forEach(function(el) {
-                el.classList.remove('active');
-                if (el.textContent.toLowerCase() === tab) {
-                    el.classList.add('active');
-                }
-            });
+            for (var i = 0; i < $.summaryTabs.length; i++) {
+                var el = $.summaryTabs[i];
+                el.classList.toggle('active', el.textContent.toLowerCase() === tab);
+            }
+            // The payload carries every tab, so re-render locally; the refresh is skipped if unchanged
+            if (lastSummaryData) renderSummaryContent(lastSummaryData);
             socket.emit('get_summary');
         }
 
-        function renderSummaryContent(data) {
-            var content = document.getElementById('summaryContent');
-            // Clear content safely
-            while (content.firstChild) {
-                content.removeChild(content.firstChild);
+        // Memoized timestamp -> locale time string, for events without a server-side time_str
+        var EVENT_TIME_CACHE_MAX = 200;
+        var eventTimeCache = new Map();
+
+        function formatEventTime(timestamp) {
+            var formatted = eventTimeCache.get(timestamp);
+            if (formatted === undefined) {
+                formatted = new Date(timestamp).toLocaleTimeString();
+                if (eventTimeCache.size >= EVENT_TIME_CACHE_MAX) {
+                    // Maps iterate in insertion order, so the first key is the oldest
+                    eventTimeCache.delete(eventTimeCache.keys().next().value);
+                }
+                eventTimeCache.set(timestamp, formatted);
             }
+            return formatted;
+        }
+
+        function createSummaryRow(time, type, message) {
+            var div = document.createElement('div');
+            div.className = 'summary-event';
+
+            var timeSpan = document.createElement('span');
+            timeSpan.className = 'event-time';
+            timeSpan.textContent = time;
+
+            var typeSpan = document.createElement('span');
+            typeSpan.className = 'event-type';
+            typeSpan.textContent = type;
+
+            var msgSpan = document.createElement('span');
+            msgSpan.className = 'event-message';
+            msgSpan.textContent = message;
+
+            div.appendChild(timeSpan);
+            div.appendChild(typeSpan);
+            div.appendChild(msgSpan);
+            return div;
+        }
+
+        // hourly/daily buckets: { requests, prs, tasks, files }
+        function formatBucketStats(stats) {
+            return formatNumber(stats.requests || 0) + ' requests, ' + (stats.prs || 0) + ' PRs, ' +
+                   (stats.files || 0) + ' files';
+        }
+
+        function renderSummaryContent(data) {
+            var content = $.summaryContent;
+            stopWindowedRender(content);
+            content.replaceChildren();
 
             if (currentSummaryTab === 'events') {
-                var events = data.events || [];
+                var events = data.recent_events || [];
                 if (events.length === 0) {
-                    var empty = document.createElement('div');
-                    empty.style.cssText = 'color: #8b949e; text-align: center; padding: 20px;';
-                    empty.textContent = 'No events yet';
-                    content.appendChild(empty);
+                    content.appendChild(emptyEventsTpl.cloneNode(true));
                     return;
                 }
-                events.slice(0, 50).forEach(function(event) {
-                    var div = document.createElement('div');
-                    div.className = 'summary-event';
-
-                    var timeSpan = document.createElement('span');
-                    timeSpan.className = 'event-time';
-                    timeSpan.textContent = new Date(event.timestamp).toLocaleTimeString();
-
-                    var typeSpan = document.createElement('span');
-                    typeSpan.className = 'event-type';
-                    typeSpan.textContent = event.type || 'info';
-
-                    var msgSpan = document.createElement('span');
-                    msgSpan.className = 'event-message';
-                    msgSpan.textContent = event.message || '';
-
-                    div.appendChild(timeSpan);
-                    div.appendChild(typeSpan);
-                    div.appendChild(msgSpan);
-                    content.appendChild(div);
+                // Server sends oldest first; show the newest at the top
+                renderWindowed(content, Math.min(events.length, 50), function(start, end) {
+                    var frag = document.createDocumentFragment();
+                    for (var k = start; k < end; k++) {
+                        var event = events[events.length - 1 - k];
+                        frag.appendChild(createSummaryRow(
+                            event.time_str || formatEventTime(event.timestamp),
+                            event.type || 'info',
+                            event.description || ''
+                        ));
+                    }
+                    content.appendChild(frag);
                 });
             } else if (currentSummaryTab === 'hourly') {
                 var hourly = data.hourly || {};
                 var hours = Object.keys(hourly).sort().reverse();
                 if (hours.length === 0) {
-                    var empty = document.createElement('div');
-                    empty.style.cssText = 'color: #8b949e; text-align: center; padding: 20px;';
-                    empty.textContent = 'No hourly data yet';
-                    content.appendChild(empty);
+                    content.appendChild(emptyHourlyTpl.cloneNode(true));
                     return;
                 }
-                hours.slice(0, 24).forEach(function(hour) {
-                    var stats = hourly[hour];
-                    var div = document.createElement('div');
-                    div.className = 'summary-event';
-
-                    var timeSpan = document.createElement('span');
-                    timeSpan.className = 'event-time';
-                    timeSpan.textContent = hour + ':00';
-
-                    var typeSpan = document.createElement('span');
-                    typeSpan.className = 'event-type';
-                    typeSpan.textContent = 'requests';
-
-                    var msgSpan = document.createElement('span');
-                    msgSpan.className = 'event-message';
-                    msgSpan.textContent = stats.requests + ' requests, ' + formatNumber(stats.tokens) + ' tokens';
-
-                    div.appendChild(timeSpan);
-                    div.appendChild(typeSpan);
-                    div.appendChild(msgSpan);
-                    content.appendChild(div);
+                renderWindowed(content, Math.min(hours.length, 24), function(start, end) {
+                    var frag = document.createDocumentFragment();
+                    for (var k = start; k < end; k++) {
+                        var stats = hourly[hours[k]];
+                        frag.appendChild(createSummaryRow(
+                            hours[k] + ':00',
+                            'requests',
+                            formatBucketStats(stats)
+                        ));
+                    }
+                    content.appendChild(frag);
                 });
             } else if (currentSummaryTab === 'daily') {
                 var daily = data.daily || {};
                 var days = Object.keys(daily).sort().reverse();
                 if (days.length === 0) {
-                    var empty = document.createElement('div');
-                    empty.style.cssText = 'color: #8b949e; text-align: center; padding: 20px;';
-                    empty.textContent = 'No daily data yet';
-                    content.appendChild(empty);
+                    content.appendChild(emptyDailyTpl.cloneNode(true));
                     return;
                 }
+                var frag = document.createDocumentFragment();
                 days.slice(0, 7).forEach(function(day) {
                     var stats = daily[day];
-                    var div = document.createElement('div');
-                    div.className = 'summary-event';
-
-                    var timeSpan = document.createElement('span');
-                    timeSpan.className = 'event-time';
-                    timeSpan.textContent = day;
-
-                    var typeSpan = document.createElement('span');
-                    typeSpan.className = 'event-type';
-                    typeSpan.textContent = 'daily';
-
-                    var msgSpan = document.createElement('span');
-                    msgSpan.className = 'event-message';
-                    msgSpan.textContent = stats.requests + ' requests, ' + formatNumber(stats.tokens) + ' tokens';
-
-                    div.appendChild(timeSpan);
-                    div.appendChild(typeSpan);
-                    div.appendChild(msgSpan);
-                    content.appendChild(div);
+                    frag.appendChild(createSummaryRow(
+                        day,
+                        'daily',
+                        formatBucketStats(stats)
+                    ));
                 });
+                content.appendChild(frag);
             }
         }
 
+        // setInterval that is paused while the tab is hidden and catches up
+        // with one immediate call when it becomes visible again
+        function visibleInterval(fn, ms) {
+            let id = null;
+            function arm() {
+                if (id === null) id = setInterval(fn, ms);
+            }
+            document.addEventListener('visibilitychange', function() {
+                if (document.visibilityState === 'visible') {
+                    fn();
+                    arm();
+                } else if (id !== null) {
+                    clearInterval(id);
+                    id = null;
+                }
+            });
+            if (document.visibilityState === 'visible') arm();
+        }
+
         // Request updates periodically
-        setInterval(function() {
+        visibleInterval(function() {
             socket.emit('get_usage');
             socket.emit('get_summary');
         }, 30000);
@@ -2715,8 +3765,8 @@ HTML_TEMPLATE = """
 
         // Toggle panel
         function toggleMultiUserPanel() {
-            const content = document.getElementById('multiuser-content');
-            const toggle = document.getElementById('multiuser-toggle');
+            const content = $.multiuserContent;
+            const toggle = $.multiuserToggle;
             content.classList.toggle('expanded');
             toggle.textContent = content.classList.contains('expanded') ? '▲' : '▼';
 
@@ -2732,17 +3782,9 @@ HTML_TEMPLATE = """
             }
         }
 
-        // Get current project path from either running or pending projects
+        // Current project path, maintained wherever currentProjectId or a pending path changes
         function getCurrentProjectPath() {
-            // Check running projects first
-            if (projectsData[currentProjectId]) {
-                return projectsData[currentProjectId].project_path;
-            }
-            // Check pending projects
-            if (pendingProjects[currentProjectId]) {
-                return pendingProjects[currentProjectId].path;
-            }
-            return null;
+            return currentProjectPath;
         }
 
         // Socket handlers for multi-user mode
@@ -2808,6 +3850,8 @@ HTML_TEMPLATE = """
         });
 
         socket.on('claims_update', function(data) {
+            if (isSameVersion(data, lastClaimsVersion)) return;
+            lastClaimsVersion = data.version;
             claimsData = data;
             renderClaims();
         });
@@ -2825,8 +3869,8 @@ HTML_TEMPLATE = """
 
         // Multi-User UI Functions
         function updateConfigUI() {
-            const status = document.getElementById('multiuser-status');
-            const taskQueueSection = document.querySelector('.task-queue-section');
+            const status = $.multiuserStatus;
+            const taskQueueSection = $.taskQueueSection;
 
             if (multiuserConfig.configured) {
                 status.textContent = 'Enabled';
@@ -2917,45 +3961,74 @@ HTML_TEMPLATE = """
             }
         }
 
+        // Constant markup fragments shared by every claim/task row
+        var CLAIM_ISSUE_OPEN = '<div class="claim-issue"><strong>#';
+        var CLAIM_USER_OPEN = '</strong> <span style="color: #58a6ff;">@';
+        var CLAIM_YOU = ' <span style="color: #3fb950;">(you)</span>';
+        var CLAIM_USER_CLOSE = '</span>';
+        var CLAIM_TITLE_OPEN = '</div><div class="claim-title" style="font-size: 11px; color: #c9d1d9; margin: 2px 0;">';
+        var CLAIM_META_OPEN = '</div><div class="claim-meta"><span class="heartbeat-indicator"><span class="heartbeat-dot ';
+        var CLAIM_RELEASE_BTN = '<button class="claim-release-btn" data-action="release">Release</button>';
+        var CLAIM_CLOSE = '</div></li>';
+        var TASK_NUMBER_OPEN = '<div class="task-item"><span class="task-number">#';
+        var TASK_TITLE_OPEN = '</span><span class="task-title">';
+        var TASK_LABELS_OPEN = '</span><div class="task-labels">';
+        var TASK_CLOSE = '</div></div>';
+
+        function renderClaimHtml(claim) {
+            var isMine = claim.is_mine;
+            var age = claim.age_minutes || 0;
+            var isStale = age > 30;
+            var heartbeatClass = isStale ? 'stale' : (age > 15 ? 'warning' : 'fresh');
+            var ageText = age < 1 ? 'just now' : age + 'm ago';
+            var title = claim.title ? (claim.title.length > 40 ? claim.title.substring(0, 40) + '...' : claim.title) : '';
+
+            return '<li class="claim-item ' + (isMine ? 'mine ' : ' ') + (isStale ? 'stale' : '') +
+                '" data-issue-number="' + claim.issue_number + '">' +
+                CLAIM_ISSUE_OPEN + claim.issue_number +
+                CLAIM_USER_OPEN + (claim.github_username || 'unknown') + CLAIM_USER_CLOSE + (isMine ? CLAIM_YOU : '') +
+                CLAIM_TITLE_OPEN + escapeHtml(title) +
+                CLAIM_META_OPEN + heartbeatClass + '"></span>' + ageText + '</span>' +
+                (isMine ? CLAIM_RELEASE_BTN : '') +
+                CLAIM_CLOSE;
+        }
+
+        function renderTaskHtml(task) {
+            var priority = task.priority ? '<span class="task-label ' + task.priority + '">' + task.priority + '</span>' : '';
+            var size = task.size ? '<span class="task-label ' + task.size + '">' + task.size + '</span>' : '';
+
+            return TASK_NUMBER_OPEN + task.issue_number +
+                TASK_TITLE_OPEN + escapeHtml(task.title) +
+                TASK_LABELS_OPEN + priority + size +
+                TASK_CLOSE;
+        }
+
         function renderClaims() {
-            const list = document.getElementById('claims-list');
-            const count = document.getElementById('claims-count');
+            const list = $.claimsList;
+            const count = $.claimsCount;
 
             count.textContent = claimsData.claims ? claimsData.claims.length : 0;
 
             if (!claimsData.claims || claimsData.claims.length === 0) {
+                stopWindowedRender(list);
                 list.innerHTML = '<li style="color: #6e7681; font-size: 11px;">No active claims</li>';
                 return;
             }
 
-            list.innerHTML = claimsData.claims.map(claim => {
-                const isMine = claim.is_mine;
-                const age = claim.age_minutes || 0;
-                const isStale = age > 30;
-                const isWarning = age > 15;
-                const heartbeatClass = isStale ? 'stale' : (isWarning ? 'warning' : 'fresh');
-                const ageText = age < 1 ? 'just now' : age + 'm ago';
-                const title = claim.title ? (claim.title.length > 40 ? claim.title.substring(0, 40) + '...' : claim.title) : '';
-                const username = claim.github_username || 'unknown';
-
-                return '<li class="claim-item ' + (isMine ? 'mine' : '') + ' ' + (isStale ? 'stale' : '') + '">' +
-                    '<div class="claim-issue">' +
-                        '<strong>#' + claim.issue_number + '</strong> ' +
-                        '<span style="color: #58a6ff;">@' + username + '</span>' +
-                        (isMine ? ' <span style="color: #3fb950;">(you)</span>' : '') +
-                    '</div>' +
-                    '<div class="claim-title" style="font-size: 11px; color: #c9d1d9; margin: 2px 0;">' + escapeHtml(title) + '</div>' +
-                    '<div class="claim-meta">' +
-                        '<span class="heartbeat-indicator"><span class="heartbeat-dot ' + heartbeatClass + '"></span>' + ageText + '</span>' +
-                        (isMine ? '<button class="claim-release-btn" onclick="releaseClaim(' + claim.issue_number + ')">Release</button>' : '') +
-                    '</div>' +
-                '</li>';
-            }).join('');
+            const claims = claimsData.claims;
+            list.innerHTML = '';
+            renderWindowed(list, claims.length, function(start, end) {
+                const parts = new Array(end - start);
+                for (let k = start; k < end; k++) {
+                    parts[k - start] = renderClaimHtml(claims[k]);
+                }
+                list.insertAdjacentHTML('beforeend', parts.join(''));
+            }, 'li');
         }
 
         function renderAvailableTasks() {
-            const list = document.getElementById('available-tasks-list');
-            const count = document.getElementById('available-count');
+            const list = $.availableTasksList;
+            const count = $.availableCount;
 
             if (!availableTasksData.tasks || availableTasksData.tasks.length === 0) {
                 count.textContent = '0';
@@ -2965,17 +4038,13 @@ HTML_TEMPLATE = """
 
             count.textContent = availableTasksData.tasks.length;
 
-            list.innerHTML = availableTasksData.tasks.slice(0, 5).map(task => {
-                const priority = task.priority ? '<span class="task-label ' + task.priority + '">' + task.priority + '</span>' : '';
-                const size = task.size ? '<span class="task-label ' + task.size + '">' + task.size + '</span>' : '';
-                const title = task.title.length > 35 ? task.title.substring(0, 35) + '...' : task.title;
-
-                return '<div class="task-item">' +
-                    '<span class="task-number">#' + task.issue_number + '</span>' +
-                    '<span class="task-title">' + escapeHtml(title) + '</span>' +
-                    '<div class="task-labels">' + priority + size + '</div>' +
-                '</div>';
-            }).join('');
+            const tasks = availableTasksData.tasks;
+            const shown = Math.min(tasks.length, 5);
+            const parts = new Array(shown);
+            for (let k = 0; k < shown; k++) {
+                parts[k] = renderTaskHtml(tasks[k]);
+            }
+            list.innerHTML = parts.join('');
         }
 
         function escapeHtml(text) {
@@ -2984,10 +4053,18 @@ HTML_TEMPLATE = """
             return div.innerHTML;
         }
 
-        // Auto-refresh claims every 30s when panel is open
-        setInterval(function() {
-            if (document.getElementById('multiuser-content') &&
-                document.getElementById('multiuser-content').classList.contains('expanded')) {
+        // Track whether the claims panel is on screen (collapsed or scrolled away = no)
+        let multiuserOnScreen = true;
+        if ($.multiuserContent && 'IntersectionObserver' in window) {
+            new IntersectionObserver(function(entries) {
+                multiuserOnScreen = entries[entries.length - 1].isIntersecting;
+            }).observe($.multiuserContent);
+        }
+
+        // Auto-refresh claims every 30s when panel is open and visible
+        visibleInterval(function() {
+            if (multiuserOnScreen && $.multiuserContent &&
+                $.multiuserContent.classList.contains('expanded')) {
                 refreshClaims();
             }
         }, 30000);
@@ -3016,124 +4093,404 @@ HTML_TEMPLATE = """
 </html>
 """
 
-def parse_todo_file(project_path):
-    """Parse TODO.md and extract incomplete tasks."""
-    import re
+TODO_FILES = (
+    'TODO.md',
+    'docs/TODO.md',
+    'docs/TASKS.md',
+    'docs/WORK_ALLOCATION.md',
+    '.github/TODO.md',
+    'TASKS.md'
+)
+
+def _scan_files(path):
+    """Names of the regular files directly inside path (empty if unreadable)."""
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name for entry in entries if entry.is_file()}
+    except OSError:
+        return set()
+
+def find_todo_files(project_path):
+    """Return the TODO_FILES present in the project, in priority order.
+
+    Lists the project root once (plus docs/ and .github/ only when they exist)
+    instead of stat-ing every candidate path.
+    """
+    present = set()
+    try:
+        with os.scandir(project_path) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    present.add(entry.name)
+                elif entry.name in ('docs', '.github') and entry.is_dir():
+                    present.update(f'{entry.name}/{name}' for name in _scan_files(entry.path))
+    except OSError:
+        return []
+    return [todo_file for todo_file in TODO_FILES if todo_file in present]
+
+# Parsed tasks per TODO file path: (st_mtime_ns, st_size, tasks); reused until the file changes
+_todo_cache = {}
+
+def _parse_todo_text(content, todo_file):
+    """Extract incomplete tasks from one TODO file's text."""
     tasks = []
-    todo_files = [
-        'TODO.md',
-        'docs/TODO.md',
-        'docs/TASKS.md',
-        'docs/WORK_ALLOCATION.md',
-        '.github/TODO.md',
-        'TASKS.md'
-    ]
-
-    for todo_file in todo_files:
-        todo_path = os.path.join(project_path, todo_file)
-        if not os.path.exists(todo_path):
+    if '[' not in content:
+        return tasks  # No checkbox anywhere, so no tasks; skip the regex scan
+
+    current_priority = 'medium'
+    for match in _TODO_RE.finditer(content):
+        # Any line, task lines included, can switch the section priority;
+        # the highest level it mentions wins
+        line_lower = match.group(0).lower()
+        for level in _TODO_PRIORITIES:
+            if level + ' priority' in line_lower or '## ' + level in line_lower:
+                current_priority = level
+                break
+
+        # Incomplete task (- [ ] or * [ ])
+        task_text = match.group('task')
+        if task_text is None:
             continue
+        task_text = task_text.strip()
+        if len(task_text) > 3:
+            tasks.append({
+                'text': task_text,
+                'priority': current_priority,
+                'source': todo_file
+            })
+    return tasks
+
+def parse_todo_file(project_path):
+    """Parse TODO.md and extract incomplete tasks.
 
+    Files whose mtime and size are unchanged since the last call are not re-read.
+    """
+    tasks = []
+
+    for todo_file in find_todo_files(project_path):
+        todo_path = os.path.join(project_path, todo_file)
         try:
+            st = os.stat(todo_path)
+            cached = _todo_cache.get(todo_path)
+            if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                tasks.extend(cached[2])
+                continue
             with open(todo_path, 'r') as f:
-                content = f.read()
-
-            current_priority = 'medium'
-            for line in content.split('\n'):
-                # Detect priority sections
-                line_lower = line.lower()
-                if 'high priority' in line_lower or '## high' in line_lower:
-                    current_priority = 'high'
-                elif 'medium priority' in line_lower or '## medium' in line_lower:
-                    current_priority = 'medium'
-                elif 'low priority' in line_lower or '## low' in line_lower:
-                    current_priority = 'low'
-
-                # Find incomplete tasks (- [ ] or * [ ])
-                match = re.match(r'^[\s]*[-*]\s*\[\s*\]\s*(.+)$', line)
-                if match:
-                    task_text = match.group(1).strip()
-                    if task_text and len(task_text) > 3:
-                        tasks.append({
-                            'text': task_text,
-                            'priority': current_priority,
-                            'source': todo_file
-                        })
+                file_tasks = _parse_todo_text(f.read(), todo_file)
+            _todo_cache[todo_path] = (st.st_mtime_ns, st.st_size, file_tasks)
+            tasks.extend(file_tasks)
         except Exception as e:
             pass
 
     return tasks
 
+def todo_signature(project_path):
+    """(path, ((file, mtime_ns, size), ...)) for the project's TODO files; changes whenever the task list can."""
+    files = []
+    for todo_file in find_todo_files(project_path):
+        try:
+            st = os.stat(os.path.join(project_path, todo_file))
+        except OSError:
+            continue
+        files.append((todo_file, st.st_mtime_ns, st.st_size))
+    return (project_path, tuple(files))
+
 @socketio.on('load_todos')
 def handle_load_todos(data):
     project_path = data.get('project_path')
     if not project_path or not os.path.exists(project_path):
+        session.pop('last_todos_sig', None)
         emit('todos_loaded', {'tasks': [], 'error': 'Invalid path'})
         return
 
+    # Tell this client to keep its task list (and selections) if no TODO file moved since its last load
+    sig = todo_signature(project_path)
+    if session.get('last_todos_sig') == sig:
+        emit('todos_loaded', {'tasks': None, 'unchanged': True})
+        return
+    session['last_todos_sig'] = sig
     tasks = parse_todo_file(project_path)
     emit('todos_loaded', {'tasks': tasks})
 
-def check_prs(project_path, socketio):
-    """Periodically check for new PRs."""
-    known_prs = set()
-    while orchestra_state["running"]:
-        try:
-            result = subprocess.run(
-                ['gh', 'pr', 'list', '--json', 'number,title,url', '--limit', '20'],
-                cwd=project_path,
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                prs = json.loads(result.stdout)
-                for pr in prs:
-                    if pr['number'] not in known_prs:
-                        known_prs.add(pr['number'])
-                        pr_data = {
-                            'number': pr['number'],
-                            'title': pr['title'],
-                            'url': pr['url']
-                        }
-                        orchestra_state["prs_created"].append(pr_data)
-                        socketio.emit('pr_created', pr_data)
-                        socketio.emit('state_update', get_serializable_state())
-        except Exception as e:
-            pass
-        time.sleep(30)
+GITHUB_API_HOST = 'api.github.com'
+PR_POLL_INTERVAL = 30       # Seconds between PR checks after something changed
+PR_POLL_MAX_INTERVAL = 300  # Backoff cap while the PR list stays the same
+GH_CLI_TIMEOUT = 30         # Seconds a `gh pr list` may take; a hang would stall every project's polling
+
+def get_github_repo(project_path):
+    """Return 'owner/repo' for the project's GitHub origin remote, or None."""
+    try:
+        result = subprocess.run(
+            ['git', 'remote', 'get-url', 'origin'],
+            cwd=project_path,
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    match = _GITHUB_REMOTE_RE.search(result.stdout.strip())
+    return f'{match.group(1)}/{match.group(2)}' if match else None
+
+class GitHubAPIError(Exception):
+    """The GitHub API answered with a status other than 200/304."""
+
+    def __init__(self, status, reason):
+        super().__init__(f'{status} {reason}')
+        self.status = status
+
+def github_connection():
+    """Open a keep-alive HTTPS connection to the GitHub API (one per watcher thread)."""
+    return http.client.HTTPSConnection(GITHUB_API_HOST, timeout=10, context=SSL_CONTEXT)
+
+def fetch_open_prs(repo, etag=None, token=None, conn=None):
+    """Conditional GET of a repo's open PRs.
+
+    Reuses `conn` when given so repeated polls skip the TLS handshake.
+    Returns (prs, etag); prs is None when GitHub answers 304 Not Modified.
+    """
+    headers = {'Accept': 'application/vnd.github+json', 'User-Agent': 'claude-orchestra-dashboard'}
+    if etag:
+        headers['If-None-Match'] = etag
+    if token:
+        headers['Authorization'] = f'token {token}'
+    owns_conn = conn is None
+    if owns_conn:
+        conn = github_connection()
+    try:
+        for attempt in range(2):
+            try:
+                conn.request('GET', f'/repos/{repo}/pulls?state=open&per_page=20', headers=headers)
+                resp = conn.getresponse()
+                break
+            except (ConnectionError, http.client.HTTPException):
+                # GitHub closed the idle keep-alive connection; reconnect once
+                conn.close()
+                if attempt:
+                    raise
+        body = resp.read()  # Always drain so the connection can be reused
+        if resp.status == 304:
+            return None, etag
+        if resp.status != 200:
+            raise GitHubAPIError(resp.status, resp.reason)
+        prs = _json_loads(body)
+        return [{'number': pr['number'], 'title': pr['title'], 'url': pr['html_url']} for pr in prs], resp.getheader('ETag')
+    finally:
+        if owns_conn:
+            conn.close()
+
+def list_prs_with_gh(project_path):
+    """List open PRs through the gh CLI (used when the REST API is unavailable).
+
+    A call that times out (e.g. stuck on an auth prompt or a stalled network)
+    counts as a poll with nothing new.
+    """
+    try:
+        result = subprocess.run(
+            ['gh', 'pr', 'list', '--json', 'number,title,url', '--limit', '20'],
+            cwd=project_path,
+            capture_output=True,
+            text=True,
+            timeout=GH_CLI_TIMEOUT
+        )
+    except subprocess.TimeoutExpired:
+        return []
+    return _json_loads(result.stdout) if result.returncode == 0 else []
+
+def new_pr_watch(state):
+    """Polling state for one project on the shared PR scheduler; the repo is resolved on first poll."""
+    return {'state': state, 'resolved': False, 'repo': None, 'conn': None, 'etag': None,
+            'interval': PR_POLL_INTERVAL, 'due': 0.0}
+
+def close_pr_watch(watch):
+    """Close a watch's keep-alive GitHub connection, if it has one."""
+    if watch['conn'] is not None:
+        watch['conn'].close()
+        watch['conn'] = None
+
+def poll_prs(watch, socketio):
+    """Check one project's repo for new PRs once and schedule its next check.
+
+    Uses ETag conditional requests against the GitHub API (a 304 is nearly free)
+    and backs off from 30s to 5 minutes while nothing changes. Falls back to
+    `gh pr list` when the repo isn't on GitHub or the API rejects the request.
+    """
+    state = watch['state']
+    project_path = state["project_path"]
+    known_prs = state["known_prs"]
+    if not watch['resolved']:
+        watch['resolved'] = True
+        watch['repo'] = get_github_repo(project_path)
+        watch['conn'] = github_connection() if watch['repo'] else None
+    new_prs = []
+    try:
+        prs = None
+        if watch['repo']:
+            try:
+                prs, watch['etag'] = fetch_open_prs(watch['repo'], watch['etag'], os.getenv('GITHUB_TOKEN'), watch['conn'])
+            except GitHubAPIError:
+                watch['repo'] = None  # e.g. private repo without a token - use gh from now on
+                close_pr_watch(watch)
+            except (OSError, http.client.HTTPException):
+                pass  # Network hiccup; try again next round
+        if not watch['repo']:
+            prs = list_prs_with_gh(project_path)
+        for pr in prs or []:
+            if pr['number'] not in known_prs:
+                known_prs.add(pr['number'])
+                new_prs.append({
+                    'number': pr['number'],
+                    'title': pr['title'],
+                    'url': pr['url']
+                })
+        if new_prs:
+            # One event per poll however many PRs appeared
+            project_id = state["project_id"]
+            state["prs_created"].extend(new_prs)
+            invalidate_state_cache(state)
+            socketio.emit('prs_created_batch', {'project_id': project_id, 'prs': new_prs}, to=project_id)
+            emit_batcher.mark_state_dirty(project_id)
+            emit_batcher.mark_projects_dirty()  # prs_count changed
+    except Exception as e:
+        pass
+    watch['interval'] = PR_POLL_INTERVAL if new_prs else min(watch['interval'] * 2, PR_POLL_MAX_INTERVAL)
+    watch['due'] = time.monotonic() + watch['interval']
+    return new_prs
+
+# One scheduler thread polls PRs for every running project; started with the first orchestra run
+pr_scheduler_stop = threading.Event()
+_pr_watches = {}  # project_id -> watch dict from new_pr_watch()
+_pr_watches_lock = threading.Lock()
+_pr_scheduler_wake = threading.Event()
+_pr_scheduler_thread = None
+
+def run_pr_scheduler():
+    """Poll each watched project when its check is due, dropping projects that stopped."""
+    while not pr_scheduler_stop.is_set():
+        now = time.monotonic()
+        with _pr_watches_lock:
+            watches = list(_pr_watches.items())
+        next_due = now + PR_POLL_MAX_INTERVAL
+        for project_id, watch in watches:
+            state = watch['state']
+            if not state["running"] or state["stop_event"].is_set():
+                with _pr_watches_lock:
+                    if _pr_watches.get(project_id) is watch:
+                        del _pr_watches[project_id]
+                close_pr_watch(watch)
+                continue
+            if watch['due'] <= now:
+                poll_prs(watch, socketio)
+            next_due = min(next_due, watch['due'])
+        # Newly watched projects set the wake event so their first poll isn't delayed
+        _pr_scheduler_wake.wait(max(0.0, next_due - time.monotonic()))
+        _pr_scheduler_wake.clear()
+
+def watch_prs(state):
+    """Add a project to the shared PR scheduler, starting the scheduler if needed."""
+    global _pr_scheduler_thread
+    with _pr_watches_lock:
+        # A restarted project replaces its old watch; that connection closes once collected
+        _pr_watches[state["project_id"]] = new_pr_watch(state)
+        if _pr_scheduler_thread is None:
+            _pr_scheduler_thread = threading.Thread(target=run_pr_scheduler, daemon=True)
+            _pr_scheduler_thread.start()
+    _pr_scheduler_wake.set()
 
 RECENT_PROJECTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.recent_projects.json')
 
-def load_recent_projects():
-    """Load recent projects from file."""
+MAX_RECENT_PROJECTS = 10
+
+# In-memory copy of the recent projects file; None until first read
+_recent_projects_cache = None
+_recent_projects_lock = threading.Lock()
+
+def _read_recent_projects_file():
     try:
         if os.path.exists(RECENT_PROJECTS_FILE):
-            with open(RECENT_PROJECTS_FILE, 'r') as f:
-                return json.load(f)
+            with open(RECENT_PROJECTS_FILE, 'rb') as f:
+                return _json_loads(f.read())
     except:
         pass
     return []
 
+def load_recent_projects():
+    """Load recent projects (read from file once, then served from memory)."""
+    global _recent_projects_cache
+    with _recent_projects_lock:
+        if _recent_projects_cache is None:
+            _recent_projects_cache = _read_recent_projects_file()
+        return list(_recent_projects_cache)
+
 def save_recent_project(path):
     """Add a project to recent projects list."""
-    projects = load_recent_projects()
-    # Remove if already exists (to move to front)
-    if path in projects:
-        projects.remove(path)
-    # Add to front
-    projects.insert(0, path)
-    # Keep only last 10
-    projects = projects[:10]
-    try:
-        with open(RECENT_PROJECTS_FILE, 'w') as f:
-            json.dump(projects, f)
-    except:
-        pass
-    return projects
+    global _recent_projects_cache
+    with _recent_projects_lock:
+        if _recent_projects_cache is None:
+            _recent_projects_cache = _read_recent_projects_file()
+        # Move to front, keeping only the most recent entries
+        projects = [path] + [p for p in _recent_projects_cache if p != path]
+        projects = projects[:MAX_RECENT_PROJECTS]
+        if projects == _recent_projects_cache:
+            return list(projects)
+        _recent_projects_cache = projects
+        # Write to a temp file and rename so a crash never leaves a half-written file
+        tmp_file = RECENT_PROJECTS_FILE + '.tmp'
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(projects, f)
+            os.replace(tmp_file, RECENT_PROJECTS_FILE)
+        except:
+            pass
+        return list(projects)
+
+_SCRIPT_BLOCK_RE = re.compile(r'(<script\b.*?</script>)', re.DOTALL)
+_MARKUP_COMMENT_RE = re.compile(r'<!--.*?-->|/\*.*?\*/', re.DOTALL)
+_LEADING_SPACE_RE = re.compile(r'\n\s+')
+
+def minify_page(html):
+    """Drop comments and indentation from the page's HTML/CSS; scripts are left untouched."""
+    parts = _SCRIPT_BLOCK_RE.split(html)
+    # Odd indexes are the captured <script> blocks
+    for i in range(0, len(parts), 2):
+        parts[i] = _LEADING_SPACE_RE.sub('\n', _MARKUP_COMMENT_RE.sub('', parts[i]))
+    return ''.join(parts)
+
+# The page only depends on startup settings, so it is rendered, minified and compressed
+# once per process: (etag, {content-encoding: body})
+_index_page = None
+_index_page_lock = threading.Lock()
+
+def get_index_page():
+    """Render HTML_TEMPLATE on first use and keep the bytes plus compressed copies."""
+    global _index_page
+    with _index_page_lock:
+        if _index_page is None:
+            with app.app_context():
+                html = render_template_string(HTML_TEMPLATE, socketio_msgpack=SOCKETIO_MSGPACK, stages=_STAGES)
+            html = minify_page(html).encode('utf-8')
+            bodies = {'identity': html, 'gzip': gzip.compress(html, 9)}
+            if brotli is not None:
+                bodies['br'] = brotli.compress(html, quality=11)
+            _index_page = (hashlib.sha256(html).hexdigest(), bodies)
+        return _index_page
 
 @app.route('/')
 def index():
-    return render_template_string(HTML_TEMPLATE)
+    etag, bodies = get_index_page()
+    # Smallest encoding the client accepts: br, then gzip, then plain
+    encoding = next((e for e in ('br', 'gzip') if e in bodies and request.accept_encodings[e]), 'identity')
+    response = Response(bodies[encoding], mimetype='text/html')
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+        etag += '-' + encoding  # Each encoding is a separate representation
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'public, max-age=60'
+    response.vary.add('Accept-Encoding')
+    # Turns into a bodiless 304 when If-None-Match matches
+    return response.make_conditional(request)
 
 @app.route('/api/state')
 def get_state():
@@ -3154,37 +4511,87 @@ def add_recent_project():
         return jsonify({'projects': projects})
     return jsonify({'error': 'Invalid path'}), 400
 
-@app.route('/api/list-dirs')
-def list_dirs():
-    """List directories in a given path."""
-    path = request.args.get('path', '/')
+# Cache of directory listings: the browser re-requests the same paths while the
+# user navigates back and forth or types a path. Entries are checked against the
+# directory's mtime (one stat instead of a full scan), so the TTL only bounds
+# how long changes mtime can't see (e.g. a subdirectory replaced by a file) stay hidden.
+DIR_LISTING_TTL = 30.0
+DIR_LISTING_CACHE_SIZE = 256
+_dir_listing_cache = {}  # path -> (expires_at, st_mtime_ns or None, listing)
+_dir_listing_lock = threading.Lock()
+
+def _scan_subdirs(path):
+    """Read the visible subdirectories of a normalized path."""
+    try:
+        # DirEntry.is_dir() answers from the directory read itself, stat'ing only symlinks
+        with os.scandir(path) as entries:
+            dirs = [entry.name for entry in entries if not entry.name.startswith('.') and entry.is_dir()]
+        dirs.sort()
+        return {'path': path, 'dirs': dirs}
+    except FileNotFoundError:
+        return {'error': 'Path does not exist', 'dirs': []}
+    except NotADirectoryError:
+        return {'error': 'Not a directory', 'dirs': []}
+    except PermissionError:
+        return {'error': 'Permission denied', 'dirs': []}
+    except Exception as e:
+        return {'error': str(e), 'dirs': []}
 
+def list_subdirs(path):
+    """List the visible subdirectories of a path as a list-dirs response dict."""
     # Normalize path
     path = os.path.normpath(path)
     if not path.startswith('/'):
         path = '/' + path
 
-    if not os.path.exists(path):
-        return jsonify({'error': 'Path does not exist', 'dirs': []})
-
-    if not os.path.isdir(path):
-        return jsonify({'error': 'Not a directory', 'dirs': []})
-
+    now = time.monotonic()
     try:
-        # List only directories, sorted alphabetically
-        dirs = []
-        for item in sorted(os.listdir(path)):
-            # Skip hidden files/folders
-            if item.startswith('.'):
-                continue
-            full_path = os.path.join(path, item)
-            if os.path.isdir(full_path):
-                dirs.append(item)
-        return jsonify({'path': path, 'dirs': dirs})
-    except PermissionError:
-        return jsonify({'error': 'Permission denied', 'dirs': []})
-    except Exception as e:
-        return jsonify({'error': str(e), 'dirs': []})
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = None  # Missing/unreadable; the scan below reports why
+    with _dir_listing_lock:
+        cached = _dir_listing_cache.get(path)
+    if cached and cached[0] > now and cached[1] == mtime:
+        return cached[2]
+
+    listing = _scan_subdirs(path)
+    with _dir_listing_lock:
+        _dir_listing_cache.pop(path, None)
+        if len(_dir_listing_cache) >= DIR_LISTING_CACHE_SIZE:
+            # Dicts keep insertion order, so the first key is the oldest entry
+            del _dir_listing_cache[next(iter(_dir_listing_cache))]
+        _dir_listing_cache[path] = (now + DIR_LISTING_TTL, mtime, listing)
+    return listing
+
+# Max paths accepted by a single /api/list-dirs-batch request
+LIST_DIRS_BATCH_LIMIT = 50
+
+@app.route('/api/list-dirs')
+def list_dirs():
+    """List directories in a given path."""
+    path = request.args.get('path', '/')
+    return jsonify(list_subdirs(path))
+
+@app.route('/api/list-dirs-batch', methods=['POST'])
+def list_dirs_batch():
+    """List directories for several paths in one round trip (used for prefetching)."""
+    data = request.get_json(silent=True) or {}
+    paths = data.get('paths', [])
+    if not isinstance(paths, list):
+        return jsonify({'error': 'paths must be a list'}), 400
+    results = {}
+    for path in paths[:LIST_DIRS_BATCH_LIMIT]:
+        if isinstance(path, str) and path:
+            results[path] = list_subdirs(path)
+    return jsonify({'results': results})
+
+@socketio.on('list_dirs')
+def handle_list_dirs(data):
+    """Socket counterpart of /api/list-dirs; the listing is returned as the ack payload."""
+    path = (data or {}).get('path') or '/'
+    if not isinstance(path, str):
+        return {'error': 'path must be a string', 'dirs': []}
+    return list_subdirs(path)
 
 @socketio.on('connect')
 def handle_connect():
@@ -3199,23 +4606,31 @@ def handle_get_state():
 def handle_get_all_projects():
     emit('projects_update', {'projects': get_all_projects_summary()})
 
+def join_project_room(project_id):
+    """Subscribe the requesting client to project_id's updates, dropping any other project's."""
+    for room in rooms():
+        if room != request.sid and room != project_id:
+            leave_room(room)
+    join_room(project_id)
+
 @socketio.on('get_project_state')
 def handle_get_project_state(data):
     project_id = data.get('project_id')
     if project_id and project_id in projects_state:
+        join_project_room(project_id)
         state = projects_state[project_id]
         emit('project_state', {
             'project_id': project_id,
             'state': get_serializable_state(state)
         })
-        emit('state_update', get_serializable_state(state))
 
 @socketio.on('stop_project')
 def handle_stop_project(data):
     project_id = data.get('project_id')
     if project_id and project_id in projects_state:
         state = projects_state[project_id]
-        state["running"] = False
+        set_state(state, running=False)
+        state["stop_event"].set()
 
         # Use process manager to stop gracefully
         success = process_manager.stop_process(project_id, timeout=10)
@@ -3224,20 +4639,22 @@ def handle_stop_project(data):
             # Fallback to manual termination if process manager fails
             state["process"].terminate()
 
-        emit('state_update', get_serializable_state(state))
-        emit('projects_update', {'projects': get_all_projects_summary()})
+        emit_batcher.mark_state_dirty(project_id)
+        emit_batcher.mark_projects_dirty()
         emit('log_line', {'line': f'Stopping orchestra for {project_id}...'})
 
 @socketio.on('remove_project')
 def handle_remove_project(data):
     project_id = data.get('project_id')
-    if project_id and project_id in projects_state:
-        state = projects_state[project_id]
+    with _projects_lock:
+        state = projects_state.pop(project_id, None) if project_id else None
+    if state is not None:
         if state.get("running"):
+            state["stop_event"].set()
             # Use process manager to stop gracefully
             process_manager.stop_process(project_id, timeout=10)
-        del projects_state[project_id]
-        emit('projects_update', {'projects': get_all_projects_summary()})
+        invalidate_state_cache()
+        emit_batcher.mark_projects_dirty()
 
 # ============================================
 # Usage Stats Socket Handlers
@@ -3297,7 +4714,7 @@ def handle_get_safeguards():
 def handle_clear_safeguard_alerts():
     """Clear safeguard alerts."""
     global safeguards
-    safeguards["alerts"] = []
+    safeguards["alerts"].clear()
     safeguards["path_violations"] = []
     emit('safeguard_status', get_safeguard_status())
     socketio.emit('log_line', {'line': '[SAFEGUARD] Alerts cleared'})
@@ -3319,14 +4736,6 @@ def handle_start(data):
         emit('log_line', {'line': 'Error: Invalid project path: ' + str(project_path)})
         return
 
-    # Check if this project is already running
-    if project_id in projects_state and projects_state[project_id].get("running"):
-        emit('log_line', {'line': f'Error: Project {project_id} is already running'})
-        return
-
-    # Save to recent projects
-    save_recent_project(project_path)
-
     # Create new project state
     project_state = create_project_state()
     project_state["running"] = True
@@ -3340,15 +4749,29 @@ def handle_start(data):
     project_state["task_queue"] = task_queue
     project_state["use_subagents"] = use_subagents
 
-    # Add to projects state
-    projects_state[project_id] = project_state
+    # Add to projects state unless this project is already running (checked and
+    # inserted under the lock so two tabs can't start the same project)
+    with _projects_lock:
+        existing = projects_state.get(project_id)
+        already_running = existing is not None and existing.get("running")
+        if not already_running:
+            projects_state[project_id] = project_state
+    if already_running:
+        emit('log_line', {'line': f'Error: Project {project_id} is already running'})
+        return
+    invalidate_state_cache(project_state)
+
+    # Save to recent projects
+    save_recent_project(project_path)
     active_project_id = project_id
 
     # Also update the global orchestra_state for backwards compatibility
     orchestra_state = project_state
 
+    # The starting tab switches to the new project
+    join_project_room(project_id)
     emit('state_update', get_serializable_state(project_state))
-    emit('projects_update', {'projects': get_all_projects_summary()})
+    emit_batcher.mark_projects_dirty()
     emit('log_line', {'line': f'Starting Claude Orchestra on {project_path} (ID: {project_id})'})
     subagent_status = 'ON' if use_subagents else 'OFF'
     emit('log_line', {'line': 'Task mode: ' + task_mode.upper() + ' | Model: ' + model.upper() + ' | Sub-Agents: ' + subagent_status})
@@ -3409,7 +4832,7 @@ def handle_start(data):
 
         # Add task queue if provided (as JSON)
         if state.get("task_queue"):
-            cmd.extend(['--task-queue', json.dumps(state["task_queue"])])
+            cmd.extend(['--task-queue', _json_dumps(state["task_queue"])])
 
         # Add sub-agents flag if enabled
         if state.get("use_subagents", True):
@@ -3429,241 +4852,232 @@ def handle_start(data):
             cwd=script_dir,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,  # Line buffered for real-time output
+            bufsize=0,  # Raw pipe; output is read in large chunks and split below
             env=env
         )
 
         # Track the process for automatic cleanup
         process_manager.track_process(pid, state["process"])
 
-        # Use select for non-blocking reads to allow stop button to work
-        import select
-        while state["running"]:
-            # Check if process ended
-            if state["process"].poll() is not None:
-                # Process ended, read remaining output
-                remaining = state["process"].stdout.read()
-                if remaining:
-                    for line in remaining.split('\n'):
-                        if line.strip():
-                            log_text = f'[{pid}] ' + line.strip()
-                            state['log_lines'].append(log_text)
-                            # Keep last 500 lines to prevent memory bloat
-                            if len(state['log_lines']) > 500:
-                                state['log_lines'] = state['log_lines'][-500:]
-                            socketio.emit('log_line', {'line': log_text, 'project_id': pid})
-                break
+        def process_line(line):
+            line_text = line.strip()
+            append_log(state, pid, f'[{pid}] ' + line_text)
+
+            # Check for rate limit and track usage
+            wait_time = check_rate_limit(line_text)
+            if wait_time:
+                append_log(state, pid, f'[{pid}] ⚠️ Rate limit detected, auto-resuming in {wait_time}s')
+                socketio.emit('usage_update', get_usage_stats())
+
+            # Check for cross-repo activity (safeguard)
+            current_project_path = state.get('project_path', '')
+            if current_project_path:
+                check_cross_repo_activity(line_text, current_project_path, pid)
+
+            # Parse stage transitions; `changed` tracks whether this line touched tracked
+            # state, `rebuild` whether the snapshot can't simply be patched by set_state()
+            # `structural` marks a stage/cycle/sub-agent change, sent without waiting out the state throttle
+            changed = True
+            rebuild = False
+            structural = False
+            stage_match = _STAGE_RE.search(line_text)
+            if stage_match is None:
+                changed = False
+            elif stage_match.lastindex <= 2:
+                stage = _STAGE_NAMES[stage_match.group(stage_match.lastindex).upper()]
+                structural = stage != state["current_stage"]
+                set_state(state, current_stage=stage)
+            elif stage_match.lastindex == 3:
+                cycle = int(stage_match.group(3))
+                structural = cycle != state["current_cycle"]
+                set_state(state, current_cycle=cycle)
+            else:
+                structural = True
+                # Reset stage for next cycle
+                set_state(state, cycles_completed=state["cycles_completed"] + 1, current_stage=None)
+                # Add to summary
+                add_summary_event('cycle', f'Cycle {state["cycles_completed"]} completed', pid)
+
+            # Parse activity from stream-json events and log output. The CLI writes
+            # compact JSON with "type" first, so two C-level compares skip plain lines
+            try:
+                if line_text.startswith('{"type"') and line_text.endswith('}'):
+                    event = _json_loads(line_text)
+                    changed = rebuild = True
 
-            # Non-blocking check if data is available (0.5s timeout)
-            ready, _, _ = select.select([state["process"].stdout], [], [], 0.5)
-            if not ready:
-                continue  # No data, loop again to check running flag
-
-            line = state["process"].stdout.readline()
-            if line:
-                line_text = line.strip()
-                log_text = f'[{pid}] ' + line_text
-                state['log_lines'].append(log_text)
-                # Keep last 500 lines to prevent memory bloat
-                if len(state['log_lines']) > 500:
-                    state['log_lines'] = state['log_lines'][-500:]
-                socketio.emit('log_line', {'line': log_text, 'project_id': pid})
-
-                # Check for rate limit and track usage
-                wait_time = check_rate_limit(line_text)
-                if wait_time:
-                    socketio.emit('log_line', {'line': f'[{pid}] ⚠️ Rate limit detected, auto-resuming in {wait_time}s'})
-                    socketio.emit('usage_update', get_usage_stats())
-
-                # Check for cross-repo activity (safeguard)
-                current_project_path = state.get('project_path', '')
-                if current_project_path:
-                    check_cross_repo_activity(line_text, current_project_path, pid)
-
-                # Parse stage transitions
-                if '[STAGE 1]' in line_text or 'IMPLEMENTER' in line_text.upper():
-                    state["current_stage"] = "implement"
-                elif '[STAGE 2]' in line_text or 'TESTER' in line_text.upper():
-                    state["current_stage"] = "test"
-                elif '[STAGE 3]' in line_text or 'REVIEWER' in line_text.upper():
-                    state["current_stage"] = "review"
-                elif '[STAGE 4]' in line_text or 'PLANNER' in line_text.upper():
-                    state["current_stage"] = "plan"
-                elif 'CYCLE' in line_text and '/' in line_text:
-                    try:
-                        cycle = int(line_text.split('CYCLE')[1].split('/')[0].strip())
-                        state["current_cycle"] = cycle
-                    except:
-                        pass
-                elif 'Cycle' in line_text and 'complete' in line_text:
-                    state["cycles_completed"] += 1
-                    state["current_stage"] = None  # Reset for next cycle
-                    # Add to summary
-                    add_summary_event('cycle', f'Cycle {state["cycles_completed"]} completed', pid)
-
-                # Parse activity from stream-json events and log output
-                try:
-                    if line_text.startswith('{') and '"type"' in line_text:
-                        event = json.loads(line_text)
-
-                        # Track tool usage from tool_use events
-                        if event.get('type') == 'tool_use':
-                            tool_name = event.get('name', event.get('tool', 'unknown'))
-                            state["tools_used"] += 1
-                            state["last_tool"] = tool_name
-                            # Track API request
-                            track_api_request()
-
-                            # Track file changes
-                            if tool_name in ('Edit', 'Write', 'NotebookEdit'):
-                                file_path = event.get('input', {}).get('file_path', '')
-                                # Check for path traversal (file outside project)
-                                current_project_path = state.get('project_path', '')
-                                if file_path and current_project_path:
-                                    check_path_traversal(file_path, current_project_path, pid)
-                                if file_path and file_path not in state["files_changed_set"]:
-                                    state["files_changed_set"].add(file_path)
-                                    state["files_changed"] = len(state["files_changed_set"])
-                                    state["last_file"] = file_path
-                                    # Add to activity log and emit
-                                    entry = {
-                                        'type': 'file',
-                                        'action': 'modified' if tool_name == 'Edit' else 'created',
-                                        'path': file_path,
-                                        'time': datetime.now().isoformat(),
-                                        'project_id': pid
-                                    }
-                                    state["activity_log"].append(entry)
-                                    socketio.emit('activity_log_entry', entry)
-                                    # Add to summary
-                                    add_summary_event('file', f'Modified {file_path.split("/")[-1]}', pid)
-
-                            # Track sub-agent invocations
-                            elif tool_name == 'Task':
-                                subagent_type = event.get('input', {}).get('subagent_type', 'unknown')
-                                state["subagent_count"] += 1
-                                state["active_subagent"] = subagent_type
-                                if subagent_type not in state["subagents_used"]:
-                                    state["subagents_used"].append(subagent_type)
-                                # Add to activity log and emit
-                                entry = {
-                                    'type': 'subagent',
-                                    'name': subagent_type,
-                                    'time': datetime.now().isoformat(),
-                                    'project_id': pid
-                                }
-                                state["activity_log"].append(entry)
-                                socketio.emit('activity_log_entry', entry)
-
-                            # Track branch creation via Bash
-                            elif tool_name == 'Bash':
-                                cmd = event.get('input', {}).get('command', '')
-                                if 'git checkout -b' in cmd or 'git branch ' in cmd:
-                                    # Extract branch name
-                                    branch_match = re.search(r'(?:checkout -b|branch)\s+([^\s]+)', cmd)
-                                    if branch_match:
-                                        branch_name = branch_match.group(1)
-                                        state["branches_created"] += 1
-                                        state["current_branch"] = branch_name
-                                        entry = {
-                                            'type': 'branch',
-                                            'name': branch_name,
-                                            'time': datetime.now().isoformat(),
-                                            'project_id': pid
-                                        }
-                                        state["activity_log"].append(entry)
-                                        socketio.emit('activity_log_entry', entry)
-                                elif 'git commit' in cmd:
-                                    entry = {
-                                        'type': 'commit',
-                                        'time': datetime.now().isoformat(),
-                                        'project_id': pid
-                                    }
-                                    state["activity_log"].append(entry)
-                                    socketio.emit('activity_log_entry', entry)
-
-                        # Clear active subagent when task completes
-                        elif event.get('type') == 'tool_result':
-                            if state["active_subagent"]:
-                                state["active_subagent"] = None
-                except (json.JSONDecodeError, KeyError):
-                    pass
-
-                # Also parse text-based tool indicators [TOOL]
-                if '[TOOL]' in line_text:
-                    tool_match = re.search(r'\[TOOL\]\s*(\w+)', line_text)
-                    if tool_match:
-                        tool_name = tool_match.group(1)
+                    # Track tool usage from tool_use events
+                    if event.get('type') == 'tool_use':
+                        tool_name = event.get('name', event.get('tool', 'unknown'))
                         state["tools_used"] += 1
                         state["last_tool"] = tool_name
-
-                # Emit activity update
-                socketio.emit('activity_update', {
-                    'project_id': pid,
-                    'branches_created': state["branches_created"],
-                    'current_branch': state["current_branch"],
-                    'files_changed': state["files_changed"],
-                    'last_file': state["last_file"],
-                    'subagent_count': state["subagent_count"],
-                    'active_subagent': state["active_subagent"],
-                    'subagents_used': state["subagents_used"],
-                    'tools_used': state["tools_used"],
-                    'last_tool': state["last_tool"]
-                })
-
-                socketio.emit('state_update', get_serializable_state(state))
-                socketio.emit('projects_update', {'projects': get_all_projects_summary()})
-
-        state["running"] = False
-        state["current_stage"] = None
+                        # Track API request
+                        track_api_request()
+
+                        # Track file changes
+                        if tool_name in ('Edit', 'Write', 'NotebookEdit'):
+                            file_path = event.get('input', {}).get('file_path', '')
+                            # Check for path traversal (file outside project)
+                            current_project_path = state.get('project_path', '')
+                            if file_path and current_project_path:
+                                check_path_traversal(file_path, current_project_path, pid)
+                            fingerprints = state["files_changed_fingerprints"]
+                            fingerprint = hash(file_path)
+                            # pop() gives None for a file already seen, True for a new one
+                            is_new = file_path and fingerprints.pop(fingerprint, True)
+                            if file_path:
+                                # Re-insert so the first key is always the least recently edited file
+                                fingerprints[fingerprint] = None
+                            if is_new:
+                                if len(fingerprints) > MAX_TRACKED_FILES:
+                                    # Capped like an LRU; a long-idle file edited again counts twice
+                                    del fingerprints[next(iter(fingerprints))]
+                                state["files_changed"] += 1
+                                state["last_file"] = file_path
+                                record_activity(state, pid, 'file', path=file_path,
+                                                action='modified' if tool_name == 'Edit' else 'created')
+                                # Add to summary
+                                add_summary_event('file', f'Modified {file_path.split("/")[-1]}', pid)
+
+                        # Track sub-agent invocations
+                        elif tool_name == 'Task':
+                            subagent_type = event.get('input', {}).get('subagent_type', 'unknown')
+                            structural = True
+                            state["subagent_count"] += 1
+                            state["active_subagent"] = subagent_type
+                            if subagent_type not in state["subagents_used"]:
+                                state["subagents_used"].append(subagent_type)
+                            record_activity(state, pid, 'subagent', name=subagent_type)
+
+                        # Track branch creation via Bash
+                        elif tool_name == 'Bash':
+                            cmd = event.get('input', {}).get('command', '')
+                            if 'git checkout -b' in cmd or 'git branch ' in cmd:
+                                # Extract branch name
+                                branch_match = _BRANCH_RE.search(cmd)
+                                if branch_match:
+                                    branch_name = branch_match.group(1)
+                                    state["branches_created"] += 1
+                                    state["current_branch"] = branch_name
+                                    record_activity(state, pid, 'branch', name=branch_name)
+                            elif 'git commit' in cmd:
+                                record_activity(state, pid, 'commit')
+
+                    # Clear active subagent when task completes
+                    elif event.get('type') == 'tool_result':
+                        if state["active_subagent"]:
+                            state["active_subagent"] = None
+                            structural = True
+            except (json.JSONDecodeError, KeyError):
+                pass
+
+            # Also parse text-based tool indicators [TOOL]
+            if '[TOOL]' in line_text:
+                tool_match = _TOOL_RE.search(line_text)
+                if tool_match:
+                    set_state(state, tools_used=state["tools_used"] + 1, last_tool=tool_match.group(1))
+                    changed = True
+
+            # Plain output lines only need the log batch; state snapshots go out on change
+            if changed:
+                if rebuild:
+                    invalidate_state_cache(state)
+                # Queue activity update only when a counter moved (only the latest per flush is sent).
+                # subagents_used is copied so later appends show up as a change.
+                activity = (state["branches_created"], state["current_branch"], state["files_changed"],
+                            state["last_file"], state["subagent_count"], state["active_subagent"],
+                            tuple(state["subagents_used"]), state["tools_used"], state["last_tool"])
+                if activity != state["_last_activity_tuple"]:
+                    state["_last_activity_tuple"] = activity
+                    emit_batcher.set_activity(pid, {
+                        'project_id': pid,
+                        'branches_created': activity[0],
+                        'current_branch': activity[1],
+                        'files_changed': activity[2],
+                        'last_file': activity[3],
+                        'subagent_count': activity[4],
+                        'active_subagent': activity[5],
+                        'subagents_used': activity[6],
+                        'tools_used': activity[7],
+                        'last_tool': activity[8]
+                    })
+
+                emit_batcher.mark_state_dirty(pid, urgent=structural)
+                emit_batcher.mark_projects_dirty(urgent=structural)
+
+        # The reader thread only drains the pipe, so slow parsing/emitting never
+        # stalls the child on a full pipe; this thread parses from the ring.
+        # Single producer, single consumer: deque append/popleft are atomic and the
+        # maxlen drops the oldest lines if the parser falls behind.
+        line_ring = deque(maxlen=LINE_QUEUE_SIZE)
+        lines_ready = threading.Event()
+
+        def enqueue(items):
+            overflow = len(line_ring) + len(items) - LINE_QUEUE_SIZE
+            if overflow > 0:
+                state["lines_dropped"] += overflow
+            line_ring.extend(items)
+            lines_ready.set()
+
+        def read_output():
+            # Block in a single read until output arrives (up to 64KiB per syscall) and
+            # split lines in userspace. Stopping terminates the process, which closes
+            # stdout and makes the read return b''. The unbuffered pipe's read() is one
+            # os.read under threads, and a cooperative read under eventlet/gevent,
+            # whose patched Popen hands back green pipe objects.
+            stdout = state["process"].stdout
+            buf = bytearray()  # Reused across reads; only holds the incomplete tail line
+            while True:
+                chunk = stdout.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                buf += chunk
+                end = buf.rfind(b'\n')
+                if end < 0:
+                    continue  # No complete line yet
+                enqueue(bytes(buf[:end]).split(b'\n'))
+                del buf[:end + 1]
+            enqueue([bytes(buf), None] if buf else [None])  # None marks EOF
+
+        socketio.start_background_task(read_output)
+
+        eof = False
+        while not eof and state["running"]:
+            lines_ready.wait()
+            lines_ready.clear()
+            # Drain everything queued since the last wakeup in one go
+            while line_ring and state["running"]:
+                raw_line = line_ring.popleft()
+                if raw_line is None:
+                    eof = True
+                    break
+                process_line(raw_line.decode('utf-8', errors='replace'))
+
+        set_state(state, running=False, current_stage=None)
+        state["stop_event"].set()
 
         # Untrack the process when it completes
         process_manager.untrack_process(pid)
 
-        socketio.emit('state_update', get_serializable_state(state))
-        socketio.emit('projects_update', {'projects': get_all_projects_summary()})
+        # Deliver any batched output together with the final status
+        emit_batcher.mark_state_dirty(pid)
+        emit_batcher.mark_projects_dirty()
+        emit_batcher.flush()
         socketio.emit('log_line', {'line': f'[{pid}] Orchestra stopped'})
 
-    def cleanup_orphans():
-        """Periodically check for and clean up orphaned Claude processes."""
-        # Use project_state and project_id from the enclosing socket handler scope
-        while project_state["running"]:
-            try:
-                # Wait 60 seconds before checking (don't spam)
-                for _ in range(60):
-                    if not project_state["running"]:
-                        return
-                    time.sleep(1)
-
-                # Detect and kill orphans in this project's directory
-                orphan_count = process_manager.detect_and_kill_orphans(project_path)
-                if orphan_count > 0:
-                    log_text = f'[{project_id}] ⚠️  Cleaned up {orphan_count} orphaned Claude process(es)'
-                    project_state['log_lines'].append(log_text)
-                    if len(project_state['log_lines']) > 500:
-                        project_state['log_lines'] = project_state['log_lines'][-500:]
-                    socketio.emit('log_line', {'line': log_text, 'project_id': project_id})
-            except Exception as e:
-                logger.error(f"Error in orphan cleanup thread: {e}")
-    
-    # Start orphan cleanup thread alongside the main orchestra thread
-    cleanup_thread = threading.Thread(target=cleanup_orphans)
-    cleanup_thread.daemon = True  # Dies when main thread exits
-    cleanup_thread.start()
-
-    thread = threading.Thread(target=run_orchestra)
-    thread.daemon = True
-    thread.start()
-
-    pr_thread = threading.Thread(target=check_prs, args=(project_path, socketio))
-    pr_thread.daemon = True
-    pr_thread.start()
+    # Make sure the shared orphan cleanup thread is watching
+    start_orphan_cleanup()
+
+    # Background tasks follow the server's async mode: OS threads by default,
+    # green threads on one OS thread under ORCHESTRA_ASYNC_MODE=eventlet/gevent
+    socketio.start_background_task(run_orchestra)
+
+    watch_prs(project_state)
 
 @socketio.on('stop_orchestra')
 def handle_stop():
     global orchestra_state
-    orchestra_state["running"] = False
+    set_state(orchestra_state, running=False)
+    orchestra_state["stop_event"].set()
 
     # Try to stop via process manager if we have a project_id
     project_id = orchestra_state.get("project_id")
@@ -3676,6 +5090,14 @@ def handle_stop():
     emit('state_update', get_serializable_state())
     emit('log_line', {'line': 'Stopping orchestra...'})
 
+class NoDelayRequestHandler(WSGIRequestHandler):
+    """Werkzeug handler with TCP_NODELAY, so small socket frames aren't held back by Nagle's algorithm.
+
+    Bulk output is already coalesced by the emit batcher; this keeps the
+    trailing small frames (state diffs, single log lines) from waiting ~40ms.
+    """
+    disable_nagle_algorithm = True
+
 if __name__ == '__main__':
     print("=" * 50)
     print("Claude Orchestra Dashboard")
@@ -3683,4 +5105,7 @@ if __name__ == '__main__':
     print("")
     print("Open http://localhost:5050 in your browser")
     print("")
-    socketio.run(app, host='0.0.0.0', port=5050, debug=False, allow_unsafe_werkzeug=True)
+    run_options = {}
+    if socketio.server.eio.async_mode == 'threading':
+        run_options['request_handler'] = NoDelayRequestHandler
+    socketio.run(app, host='0.0.0.0', port=5050, debug=False, allow_unsafe_werkzeug=True, **run_options)
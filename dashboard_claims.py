@@ -483,6 +483,14 @@ def _sync_todos_sync(project_path: str) -> Dict:
         return {'success': False, 'error': str(e)}
 
 
+def _claims_version(claim_data: List[Dict]) -> int:
+    """Change token over the rendered claim fields (fits in a JS number)."""
+    return hash(tuple(
+        (c['issue_number'], c['title'], c['github_username'], c['is_mine'], c['age_minutes'])
+        for c in claim_data
+    )) & 0x1FFFFFFFFFFFFF
+
+
 def _get_claims_data_sync() -> Dict:
     """Get claims data synchronously."""
     if not _setup_state['configured']:
@@ -528,7 +536,8 @@ def _get_claims_data_sync() -> Dict:
             return {
                 'enabled': True,
                 'claims': claim_data,
-                'my_agent_id': agent_id
+                'my_agent_id': agent_id,
+                'version': _claims_version(claim_data)
             }
 
         loop = asyncio.new_event_loop()
@@ -10,7 +10,7 @@ import subprocess
 import logging
 import time
 import psutil
-from typing import Dict, Set, Optional
+from typing import Dict, Iterable, Set, Optional
 from threading import Lock
 
 logger = logging.getLogger(__name__)
@@ -155,7 +155,26 @@ class ProcessManager:
         Returns:
             Number of orphaned processes killed
         """
-        killed_count = 0
+        return sum(self._kill_orphans({project_path} if project_path else None).values())
+
+    def detect_and_kill_orphans_in(self, project_paths: Iterable[str]) -> Dict[str, int]:
+        """
+        Kill orphans running in any of several project directories in one process scan.
+
+        Args:
+            project_paths: Directories whose orphaned processes should be killed
+
+        Returns:
+            Number of orphaned processes killed, keyed by project path
+        """
+        project_paths = set(project_paths)
+        if not project_paths:
+            return {}
+        return self._kill_orphans(project_paths)
+
+    def _kill_orphans(self, project_paths: Optional[Set[str]]) -> Dict[Optional[str], int]:
+        """Single pass over the process table; counts are keyed by cwd (None when unfiltered)."""
+        killed: Dict[Optional[str], int] = {}
 
         try:
             for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'cwd']):
@@ -181,10 +200,11 @@ class ProcessManager:
                         if pid in self._tracked_pids:
                             continue  # Still tracked, not an orphan
 
-                    # Check project path if specified
-                    if project_path:
-                        proc_cwd = proc.info.get('cwd')
-                        if proc_cwd != project_path:
+                    # Check project paths if specified
+                    key = None
+                    if project_paths is not None:
+                        key = proc.info.get('cwd')
+                        if key not in project_paths:
                             continue
 
                     # This is an orphan - kill it
@@ -193,7 +213,7 @@ class ProcessManager:
 
                     # Wait for graceful exit
                     proc.wait(timeout=5)
-                    killed_count += 1
+                    killed[key] = killed.get(key, 0) + 1
 
                 except psutil.NoSuchProcess:
                     # Process already exited
@@ -202,7 +222,7 @@ class ProcessManager:
                     # Force kill if needed
                     try:
                         proc.kill()
-                        killed_count += 1
+                        killed[key] = killed.get(key, 0) + 1
                     except:
                         pass
                 except Exception as e:
@@ -211,10 +231,11 @@ class ProcessManager:
         except Exception as e:
             logger.error(f"Error during orphan detection: {e}")
 
+        killed_count = sum(killed.values())
         if killed_count > 0:
             logger.info(f"Killed {killed_count} orphaned process(es)")
 
-        return killed_count
+        return killed
 
     def _handle_shutdown_signal(self, signum, frame):
         """Handle shutdown signals (SIGTERM, SIGINT)."""
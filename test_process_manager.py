@@ -308,6 +308,28 @@ class TestOrphanDetection:
             orphan_in_project.terminate.assert_called_once()
             orphan_elsewhere.terminate.assert_not_called()
 
+    def test_orphan_detection_across_project_paths(self, process_manager):
+        """Test one scan kills orphans in several projects and counts them per path."""
+        def make_orphan(pid, cwd):
+            orphan = Mock()
+            orphan.info = {
+                'pid': pid,
+                'name': 'claude',
+                'cmdline': ['claude', '--dangerously', 'start'],
+                'cwd': cwd
+            }
+            return orphan
+
+        orphans = [make_orphan(1, '/test/a'), make_orphan(2, '/test/b'),
+                   make_orphan(3, '/test/a'), make_orphan(4, '/test/other')]
+
+        with patch('psutil.process_iter', return_value=orphans) as process_iter:
+            killed = process_manager.detect_and_kill_orphans_in(['/test/a', '/test/b'])
+
+            assert killed == {'/test/a': 2, '/test/b': 1}
+            assert process_iter.call_count == 1
+            orphans[3].terminate.assert_not_called()
+
     def test_orphan_force_kill_on_timeout(self, process_manager):
         """Test that orphan is force killed if graceful termination times out."""
         orphan = Mock()
@@ -0,0 +1,751 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the dashboard server helpers and HTTP endpoints.
+"""
+
+import json
+import os
+import subprocess
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import dashboard
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+@pytest.fixture
+def client():
+    """Create a Flask test client for the dashboard app."""
+    dashboard.app.config['TESTING'] = True
+    return dashboard.app.test_client()
+
+
+@pytest.fixture
+def dir_tree(tmp_path):
+    """Create a small directory tree with hidden entries and plain files."""
+    (tmp_path / "alpha").mkdir()
+    (tmp_path / "beta").mkdir()
+    (tmp_path / ".hidden").mkdir()
+    (tmp_path / "notes.txt").write_text("not a directory")
+    (tmp_path / "alpha" / "nested").mkdir()
+    return tmp_path
+
+
+# =============================================================================
+# Directory Listing Tests
+# =============================================================================
+
+class TestListDirs:
+    """Tests for the directory browser endpoints."""
+
+    def test_list_subdirs_skips_hidden_and_files(self, dir_tree):
+        """Only visible directories are listed, sorted by name."""
+        result = dashboard.list_subdirs(str(dir_tree))
+        assert result == {'path': str(dir_tree), 'dirs': ['alpha', 'beta']}
+
+    def test_list_subdirs_missing_path(self, tmp_path):
+        """A missing path reports an error with no entries."""
+        result = dashboard.list_subdirs(str(tmp_path / "missing"))
+        assert result['error'] == 'Path does not exist'
+        assert result['dirs'] == []
+
+    def test_list_subdirs_cached_until_directory_changes(self, dir_tree, monkeypatch):
+        """Repeated listings are served from the cache until the directory's mtime moves."""
+        first = dashboard.list_subdirs(str(dir_tree))
+        assert dashboard.list_subdirs(str(dir_tree)) is first
+
+        (dir_tree / "gamma").mkdir()
+        os.utime(dir_tree, ns=(0, 0))  # Guarantee a different mtime on coarse-grained filesystems
+        assert dashboard.list_subdirs(str(dir_tree))['dirs'] == ['alpha', 'beta', 'gamma']
+
+        monkeypatch.setattr(dashboard, 'DIR_LISTING_TTL', -1)  # Expired as soon as stored
+        dashboard._dir_listing_cache.clear()
+        assert dashboard.list_subdirs(str(dir_tree)) is not dashboard.list_subdirs(str(dir_tree))
+
+    def test_list_dirs_endpoint(self, client, dir_tree):
+        """GET /api/list-dirs returns the listing for one path."""
+        response = client.get('/api/list-dirs', query_string={'path': str(dir_tree)})
+        assert response.get_json()['dirs'] == ['alpha', 'beta']
+
+    def test_list_dirs_batch_endpoint(self, client, dir_tree):
+        """POST /api/list-dirs-batch returns listings keyed by requested path."""
+        alpha = str(dir_tree / "alpha")
+        missing = str(dir_tree / "missing")
+        response = client.post('/api/list-dirs-batch', json={'paths': [alpha, missing]})
+        results = response.get_json()['results']
+        assert results[alpha]['dirs'] == ['nested']
+        assert results[missing]['error'] == 'Path does not exist'
+
+    def test_list_dirs_batch_rejects_non_list(self, client):
+        """A non-list paths value is rejected."""
+        response = client.post('/api/list-dirs-batch', json={'paths': '/tmp'})
+        assert response.status_code == 400
+
+    def test_list_dirs_over_socket(self, dir_tree):
+        """The list_dirs socket event acknowledges with the same listing as the HTTP endpoint."""
+        socket_client = dashboard.socketio.test_client(dashboard.app)
+        ack = socket_client.emit('list_dirs', {'path': str(dir_tree)}, callback=True)
+        assert ack == {'path': str(dir_tree), 'dirs': ['alpha', 'beta']}
+        socket_client.disconnect()
+
+
+# =============================================================================
+# Index Page Tests
+# =============================================================================
+
+class TestIndexPage:
+    """Tests for serving the prerendered dashboard page."""
+
+    def test_gzip_negotiated(self, client):
+        """Clients accepting gzip get the precompressed copy of the same page."""
+        plain = client.get('/', headers={'Accept-Encoding': 'identity'})
+        compressed = client.get('/', headers={'Accept-Encoding': 'gzip, deflate'})
+        assert 'Content-Encoding' not in plain.headers
+        assert compressed.headers['Content-Encoding'] == 'gzip'
+        assert plain.mimetype == compressed.mimetype == 'text/html'
+        assert dashboard.gzip.decompress(compressed.data) == plain.data
+        assert b'Claude Orchestra' in plain.data
+
+    def test_minify_keeps_scripts(self):
+        """Comments and indentation go; script bodies stay byte-for-byte."""
+        script = '<script>\n    var a = 1; /* keep */\n    // <!-- keep -->\n</script>'
+        html = '<div>\n    <!-- note -->\n    <style>\n        /* c */ .x { }\n    </style>\n' + script + '\n    </div>'
+        assert dashboard.minify_page(html) == '<div>\n<style>\n.x { }\n</style>\n' + script + '\n</div>'
+
+    def test_conditional_get_not_modified(self, client):
+        """A repeat request with the ETag is answered with 304."""
+        first = client.get('/')
+        second = client.get('/', headers={'If-None-Match': first.headers['ETag']})
+        assert second.status_code == 304
+        assert second.data == b''
+
+
+# =============================================================================
+# JSON Provider Tests
+# =============================================================================
+
+class TestJsonProvider:
+    """Tests for the orjson-backed JSON encoding."""
+
+    def test_jsonify_round_trip(self):
+        """API responses and socket packets encode like the stdlib would."""
+        if dashboard.orjson is None:
+            pytest.skip('orjson not installed')
+        payload = {'hourly': {'2024-01-01-10': {'prs': 1}}, 1: 'int key', 'name': 'caf\u00e9'}
+        with dashboard.app.app_context():
+            response = dashboard.jsonify(payload)
+        assert response.mimetype == 'application/json'
+        assert json.loads(response.data) == json.loads(json.dumps(payload))
+        assert json.loads(dashboard._OrjsonPacketJSON.dumps(payload, separators=(',', ':'))) == \
+            json.loads(json.dumps(payload))
+
+
+# =============================================================================
+# Payload Version Tests
+# =============================================================================
+
+class TestPayloadVersion:
+    """Tests for the change tokens attached to polled payloads."""
+
+    def test_summary_version_stable_until_new_event(self):
+        """Repeated polls share a version; a new event changes it."""
+        first = dashboard.get_summary_stats('today')
+        assert dashboard.get_summary_stats('today')['version'] == first['version']
+
+        dashboard.add_summary_event('info', 'version test')
+        assert dashboard.get_summary_stats('today')['version'] != first['version']
+
+    def test_summary_payload_has_keys_the_page_reads(self, monkeypatch):
+        """renderSummaryContent reads recent_events[].time_str/type/description and bucket counts."""
+        monkeypatch.setattr(dashboard, 'summary_data',
+                            {'hourly': {}, 'daily': {}, 'events': dashboard.deque(maxlen=10)})
+        dashboard.add_summary_event('file_changed', 'Modified a.py', 'proj')
+
+        stats = dashboard.get_summary_stats('today')
+        event = stats['recent_events'][-1]
+        assert (event['type'], event['description']) == ('file_changed', 'Modified a.py')
+        assert len(event['time_str']) == len('HH:MM:SS')
+        bucket = next(iter(stats['daily'].values()))
+        assert {'requests', 'prs', 'files'} <= set(bucket)
+
+        page = dashboard.HTML_TEMPLATE
+        for js_ref in ('data.recent_events', 'event.time_str', 'event.description',
+                       'stats.requests', 'stats.prs', 'stats.files'):
+            assert js_ref in page
+
+    def test_usage_resets_checked_only_after_rollover(self, monkeypatch):
+        """Stale period keys are only noticed once the next midnight has passed."""
+        monkeypatch.setitem(dashboard.usage_stats, 'last_reset_daily', 'stale')
+        monkeypatch.setitem(dashboard.usage_stats, 'requests_today', 5)
+        monkeypatch.setattr(dashboard, '_next_usage_rollover', dashboard.time.time() + 60)
+        assert dashboard.get_usage_stats()['requests_today'] == 5
+
+        monkeypatch.setattr(dashboard, '_next_usage_rollover', 0.0)
+        assert dashboard.get_usage_stats()['requests_today'] == 0
+        assert dashboard._next_usage_rollover > dashboard.time.time()
+
+    def test_usage_version_fits_js_number(self):
+        """Versions stay within the exactly-representable JS integer range."""
+        version = dashboard.get_usage_stats()['version']
+        assert 0 <= version < 2 ** 53
+
+
+# =============================================================================
+# TODO Parsing Tests
+# =============================================================================
+
+class TestParseTodoFile:
+    """Tests for TODO.md task extraction."""
+
+    def test_incomplete_tasks_with_priority_sections(self, tmp_path):
+        """Unchecked items are returned with the priority of their section."""
+        (tmp_path / "TODO.md").write_text(
+            "## High Priority\n"
+            "- [ ] Fix login bug\n"
+            "- [x] Already done\n"
+            "## Low Priority\n"
+            "  * [ ] Tidy docs\n"
+            "- [ ] abc\n"
+        )
+        tasks = dashboard.parse_todo_file(str(tmp_path))
+        assert [(t['text'], t['priority']) for t in tasks] == [
+            ('Fix login bug', 'high'),
+            ('Tidy docs', 'low'),
+        ]
+        assert tasks[0]['source'] == 'TODO.md'
+
+    def test_task_line_sets_priority(self, tmp_path):
+        """A task that names a priority switches the current priority, itself included."""
+        (tmp_path / "TODO.md").write_text(
+            "- [ ] high priority: fix X\n"
+            "- [ ] Follow-up task\n"
+        )
+        tasks = dashboard.parse_todo_file(str(tmp_path))
+        assert [(t['text'], t['priority']) for t in tasks] == [
+            ('high priority: fix X', 'high'),
+            ('Follow-up task', 'high'),
+        ]
+
+    def test_highest_priority_on_line_wins(self, tmp_path):
+        """A line mentioning several levels takes the highest, not the first."""
+        (tmp_path / "TODO.md").write_text(
+            "Low priority items were promoted to high priority\n"
+            "- [ ] Ship it\n"
+        )
+        tasks = dashboard.parse_todo_file(str(tmp_path))
+        assert [(t['text'], t['priority']) for t in tasks] == [('Ship it', 'high')]
+
+    def test_unchanged_file_served_from_cache(self, tmp_path, monkeypatch):
+        """A second parse of an unmodified file doesn't read it again."""
+        todo = tmp_path / "TODO.md"
+        todo.write_text("- [ ] First task\n")
+        assert [t['text'] for t in dashboard.parse_todo_file(str(tmp_path))] == ['First task']
+
+        monkeypatch.setattr(dashboard, '_parse_todo_text', lambda content, name: pytest.fail('re-parsed'))
+        assert [t['text'] for t in dashboard.parse_todo_file(str(tmp_path))] == ['First task']
+
+        monkeypatch.undo()
+        todo.write_text("- [ ] Second task, longer\n")  # Size changes even if mtime doesn't
+        assert [t['text'] for t in dashboard.parse_todo_file(str(tmp_path))] == ['Second task, longer']
+
+    def test_load_todos_unchanged_for_same_client(self, tmp_path):
+        """A client reloading untouched TODO files gets an 'unchanged' reply instead of the tasks."""
+        todo = tmp_path / "TODO.md"
+        todo.write_text("- [ ] Write the docs\n")
+        socket_client = dashboard.socketio.test_client(dashboard.app)
+
+        def load():
+            socket_client.emit('load_todos', {'project_path': str(tmp_path)})
+            return [r['args'][0] for r in socket_client.get_received() if r['name'] == 'todos_loaded']
+
+        socket_client.get_received()
+        assert [t['text'] for t in load()[0]['tasks']] == ['Write the docs']
+        assert load() == [{'tasks': None, 'unchanged': True}]
+
+        todo.write_text("- [ ] Write the docs\n- [ ] Ship it\n")
+        os.utime(todo, ns=(0, 0))
+        assert [t['text'] for t in load()[0]['tasks']] == ['Write the docs', 'Ship it']
+        socket_client.disconnect()
+
+    def test_find_todo_files_in_priority_order(self, tmp_path):
+        """Candidates in the root, docs/ and .github/ are found in TODO_FILES order."""
+        (tmp_path / "docs").mkdir()
+        (tmp_path / ".github").mkdir()
+        (tmp_path / "TASKS.md").write_text("")
+        (tmp_path / "docs" / "WORK_ALLOCATION.md").write_text("")
+        (tmp_path / ".github" / "TODO.md").write_text("")
+        (tmp_path / "TODO.md").mkdir()
+        assert dashboard.find_todo_files(str(tmp_path)) == [
+            'docs/WORK_ALLOCATION.md', '.github/TODO.md', 'TASKS.md'
+        ]
+        assert dashboard.find_todo_files(str(tmp_path / "missing")) == []
+
+    def test_priority_heading_and_inline_mentions(self, tmp_path):
+        """'## Low' headings and 'high priority' prose both switch the section."""
+        (tmp_path / "TODO.md").write_text(
+            "- [ ] Default task\n"
+            "## LOW\n"
+            "- [ ] Low task\n"
+            "These are high priority:\n"
+            "- [] Urgent task\n"
+        )
+        tasks = dashboard.parse_todo_file(str(tmp_path))
+        assert [(t['text'], t['priority']) for t in tasks] == [
+            ('Default task', 'medium'),
+            ('Low task', 'low'),
+            ('Urgent task', 'high'),
+        ]
+
+
+# =============================================================================
+# Emit Batching Tests
+# =============================================================================
+
+class TestEmitBatcher:
+    """Tests for coalescing per-line socket emits."""
+
+    def test_flush_sends_one_batch_update_to_project_room(self, monkeypatch):
+        """Queued lines and activity arrive in one frame, only for the project the client has open."""
+        for pid in ('proj', 'other'):
+            monkeypatch.setitem(dashboard.projects_state, pid, dashboard.create_project_state())
+        socket_client = dashboard.socketio.test_client(dashboard.app)
+        socket_client.emit('get_project_state', {'project_id': 'other'})
+        socket_client.emit('get_project_state', {'project_id': 'proj'})  # Switching leaves 'other'
+        socket_client.get_received()
+
+        batcher = dashboard._EmitBatcher()
+        batcher.add_log('proj', '[proj] first', 1)
+        batcher.add_log('other', '[other] line', 7)
+        batcher.add_log('proj', '[proj] second', 2)
+        batcher.set_activity('proj', {'project_id': 'proj', 'tools_used': 1})
+        batcher.mark_projects_dirty()
+        batcher.mark_projects_dirty()
+        batcher.flush()
+
+        received = socket_client.get_received()
+        updates = [r['args'][0] for r in received if r['name'] == 'batch_update']
+        assert updates == [{
+            'project_id': 'proj',
+            'log': {'lines': ['[proj] first', '[proj] second'], 'seq': 2},
+            'activity': {'project_id': 'proj', 'tools_used': 1},
+        }]
+        assert sum(1 for r in received if r['name'] == 'projects_update') == 1
+        socket_client.disconnect()
+
+    def test_full_log_buffer_cuts_interval_short(self):
+        """Reaching max_lines or max_bytes of pending log asks for an immediate flush."""
+        batcher = dashboard._EmitBatcher(interval=60, max_lines=3, max_bytes=10)
+        batcher._thread = object()  # Keep the flush loop from starting
+        batcher.add_log('proj', 'a', 1)
+        batcher.add_log('proj', 'b', 2)
+        assert not batcher._full.is_set()
+        batcher.add_log('proj', 'c', 3)
+        assert batcher._full.is_set()
+
+        batcher.flush()
+        batcher._full.clear()
+        batcher.add_log('proj', 'x' * 10, 4)
+        assert batcher._full.is_set()
+
+    def test_state_updates_throttled_until_forced(self):
+        """Unforced flushes send projects_update at most once per state_interval."""
+        socket_client = dashboard.socketio.test_client(dashboard.app)
+        socket_client.get_received()
+
+        batcher = dashboard._EmitBatcher(state_interval=60)
+        batcher.mark_projects_dirty()
+        batcher.flush(force=False)
+        batcher.mark_projects_dirty()
+        batcher.flush(force=False)
+        assert sum(1 for r in socket_client.get_received() if r['name'] == 'projects_update') == 1
+
+        batcher.flush()
+        assert sum(1 for r in socket_client.get_received() if r['name'] == 'projects_update') == 1
+
+        # Structural changes skip the throttle
+        batcher.mark_projects_dirty(urgent=True)
+        batcher.flush(force=False)
+        assert sum(1 for r in socket_client.get_received() if r['name'] == 'projects_update') == 1
+        socket_client.disconnect()
+
+    def test_activity_sent_as_delta(self, monkeypatch):
+        """After the first flush only changed activity fields are emitted."""
+        monkeypatch.setitem(dashboard.projects_state, 'proj', dashboard.create_project_state())
+        socket_client = dashboard.socketio.test_client(dashboard.app)
+        socket_client.emit('get_project_state', {'project_id': 'proj'})
+        socket_client.get_received()
+
+        batcher = dashboard._EmitBatcher()
+        batcher.set_activity('proj', {'project_id': 'proj', 'tools_used': 1, 'last_tool': 'Read'})
+        batcher.flush()
+        batcher.set_activity('proj', {'project_id': 'proj', 'tools_used': 2, 'last_tool': 'Read'})
+        batcher.flush()
+
+        deltas = [r['args'][0]['activity'] for r in socket_client.get_received() if r['name'] == 'batch_update']
+        assert deltas == [{'project_id': 'proj', 'tools_used': 1, 'last_tool': 'Read'},
+                          {'project_id': 'proj', 'tools_used': 2}]
+        socket_client.disconnect()
+
+
+# =============================================================================
+# PR Watcher Tests
+# =============================================================================
+
+class TestPrWatcher:
+    """Tests for the GitHub PR polling helpers."""
+
+    def test_fetch_open_prs_not_modified(self):
+        """A 304 reports no change and keeps the previous ETag."""
+        class FakeResponse:
+            status, reason = 304, 'Not Modified'
+
+            def read(self):
+                return b''
+
+        class FakeConnection:
+            def request(self, method, url, headers):
+                assert headers['If-None-Match'] == '"abc"'
+
+            def getresponse(self):
+                return FakeResponse()
+
+        assert dashboard.fetch_open_prs('owner/repo', etag='"abc"', conn=FakeConnection()) == (None, '"abc"')
+
+    def test_fetch_open_prs_reconnects_once(self):
+        """A dropped keep-alive connection is retried on a fresh one."""
+        class FakeResponse:
+            status, reason = 200, 'OK'
+
+            def read(self):
+                return b'[{"number": 1, "title": "t", "html_url": "u"}]'
+
+            def getheader(self, name):
+                return '"e1"'
+
+        class FakeConnection:
+            requests = 0
+
+            def request(self, method, url, headers):
+                self.requests += 1
+                if self.requests == 1:
+                    raise dashboard.http.client.RemoteDisconnected('closed')
+
+            def getresponse(self):
+                return FakeResponse()
+
+            def close(self):
+                pass
+
+        conn = FakeConnection()
+        assert dashboard.fetch_open_prs('owner/repo', conn=conn) == ([{'number': 1, 'title': 't', 'url': 'u'}], '"e1"')
+        assert conn.requests == 2
+
+    def test_get_github_repo_from_origin(self, tmp_path):
+        """owner/repo is parsed from an SSH origin URL."""
+        subprocess.run(['git', 'init', '-q', str(tmp_path)], check=True)
+        subprocess.run(['git', 'remote', 'add', 'origin', 'git@github.com:owner/repo.git'],
+                       cwd=tmp_path, check=True)
+        assert dashboard.get_github_repo(str(tmp_path)) == 'owner/repo'
+
+    def test_poll_prs_records_on_its_own_project(self, monkeypatch):
+        """New PRs land on the watched project's state and go out in one event."""
+        state = dashboard.create_project_state()
+        state.update(running=True, project_id='proj', project_path='/nonexistent')
+        monkeypatch.setitem(dashboard.projects_state, 'proj', state)
+        monkeypatch.setattr(dashboard, 'get_github_repo', lambda path: None)
+        socket_client = dashboard.socketio.test_client(dashboard.app)
+        socket_client.emit('get_project_state', {'project_id': 'proj'})
+        socket_client.get_received()
+
+        prs = [{'number': 7, 'title': 'Add feature', 'url': 'https://example/pr/7'},
+               {'number': 8, 'title': 'Fix bug', 'url': 'https://example/pr/8'}]
+
+        monkeypatch.setattr(dashboard, 'list_prs_with_gh', lambda path: prs)
+        watch = dashboard.new_pr_watch(state)
+        assert dashboard.poll_prs(watch, dashboard.socketio) == prs
+        assert watch['interval'] == dashboard.PR_POLL_INTERVAL
+
+        # Nothing new on the next poll: backs off and emits nothing
+        assert dashboard.poll_prs(watch, dashboard.socketio) == []
+        assert watch['interval'] == 2 * dashboard.PR_POLL_INTERVAL
+
+        assert list(state['prs_created']) == prs
+        assert state['known_prs'] == {7, 8}
+        assert dashboard.get_serializable_state(state)['prs_created'][0]['number'] == 7
+        batches = [r for r in socket_client.get_received() if r['name'] == 'prs_created_batch']
+        assert [b['args'][0]['prs'] for b in batches] == [prs]
+        socket_client.disconnect()
+
+    def test_list_prs_with_gh_times_out_as_empty_poll(self, monkeypatch):
+        """A hung gh call is bounded by GH_CLI_TIMEOUT and reported as no PRs."""
+        calls = []
+
+        def hung_run(cmd, **kwargs):
+            calls.append(kwargs.get('timeout'))
+            raise subprocess.TimeoutExpired(cmd, kwargs.get('timeout'))
+
+        monkeypatch.setattr(dashboard.subprocess, 'run', hung_run)
+        assert dashboard.list_prs_with_gh('/nonexistent') == []
+        assert calls == [dashboard.GH_CLI_TIMEOUT]
+
+    def test_pr_scheduler_polls_due_projects_and_drops_stopped(self, monkeypatch):
+        """One scheduler pass polls only due, running projects and forgets stopped ones."""
+        due, later, stopped = (dashboard.create_project_state() for _ in range(3))
+        for pid, state in (('due', due), ('later', later), ('stopped', stopped)):
+            state.update(running=pid != 'stopped', project_id=pid, project_path='/' + pid)
+        watches = {pid: dashboard.new_pr_watch(state)
+                   for pid, state in (('due', due), ('later', later), ('stopped', stopped))}
+        watches['later']['due'] = dashboard.time.monotonic() + 60
+        monkeypatch.setattr(dashboard, '_pr_watches', dict(watches))
+        monkeypatch.setattr(dashboard, 'pr_scheduler_stop', dashboard.threading.Event())
+        polled = []
+
+        def fake_poll(watch, socketio):
+            polled.append(watch['state']['project_id'])
+            watch['due'] = dashboard.time.monotonic() + 30
+            dashboard.pr_scheduler_stop.set()  # Stop after this pass
+            dashboard._pr_scheduler_wake.set()
+
+        monkeypatch.setattr(dashboard, 'poll_prs', fake_poll)
+        dashboard.run_pr_scheduler()
+
+        assert polled == ['due']
+        assert set(dashboard._pr_watches) == {'due', 'later'}
+
+
+# =============================================================================
+# Project State Tests
+# =============================================================================
+
+class TestProjectState:
+    """Tests for per-project state and its serialized form."""
+
+    def test_log_lines_capped_and_serialized_as_list(self):
+        """The log buffer keeps only the newest lines and serializes to a list."""
+        state = dashboard.create_project_state()
+        for i in range(dashboard.MAX_LOG_LINES + 10):
+            state['log_lines'].append(f'line {i}')
+
+        serialized = dashboard.get_serializable_state(state)
+        assert isinstance(serialized['log_lines'], list)
+        assert len(serialized['log_lines']) == dashboard.MAX_LOG_LINES
+        assert serialized['log_lines'][0] == 'line 10'
+        assert 'process' not in serialized and 'stop_event' not in serialized and 'lock' not in serialized
+
+    def test_log_seq_only_in_full_snapshots(self):
+        """append_log() numbers lines; batched state updates leave the log out."""
+        state = dashboard.create_project_state()
+        dashboard.append_log(state, 'proj', 'one')
+        dashboard.append_log(state, 'proj', 'two')
+
+        full = dashboard.get_serializable_state(state)
+        assert full['log_lines'] == ['one', 'two'] and full['log_seq'] == 2
+        delta = dashboard.get_serializable_state(state, include_logs=False)
+        assert 'log_lines' not in delta and 'log_seq' not in delta
+        dashboard.emit_batcher.flush()
+
+    def test_state_diff_has_only_changed_fields(self):
+        """Each diff carries the fields changed since the previous one, plus project_id."""
+        state = dashboard.create_project_state()
+        state['project_id'] = 'proj'
+        first = dashboard.get_state_diff(state)
+        assert first['running'] is False and first['project_id'] == 'proj'
+
+        dashboard.set_state(state, tools_used=4)
+        assert dashboard.get_state_diff(state) == {'project_id': 'proj', 'tools_used': 4}
+        assert dashboard.get_state_diff(state) is None
+
+        state['subagents_used'].append('explorer')
+        dashboard.invalidate_state_cache(state)
+        assert dashboard.get_state_diff(state) == {'project_id': 'proj', 'subagents_used': ['explorer']}
+
+    def test_activity_log_is_bounded_ring(self):
+        """Old activity entries are evicted and the snapshot ships only the newest as dicts."""
+        state = dashboard.create_project_state()
+        state['project_id'] = 'proj'
+        for i in range(dashboard.MAX_ACTIVITY_LOG + 1):
+            dashboard.record_activity(state, 'proj', 'branch', name=f'b{i}')
+        assert len(state['activity_log']) == dashboard.MAX_ACTIVITY_LOG
+
+        activity_log = dashboard.get_serializable_state(state)['activity_log']
+        assert isinstance(activity_log, list)
+        assert len(activity_log) == dashboard.ACTIVITY_LOG_SNAPSHOT
+        assert activity_log[-1]['name'] == f'b{dashboard.MAX_ACTIVITY_LOG}'
+        assert set(activity_log[-1]) == {'type', 'time', 'project_id', 'name'}
+
+    def test_serialized_snapshot_reused_until_invalidated(self):
+        """Scalar changes show up only after the cache is invalidated; logs are always fresh."""
+        state = dashboard.create_project_state()
+        assert dashboard.get_serializable_state(state)['current_stage'] is None
+
+        state['current_stage'] = 'test'
+        state['log_lines'].append('new line')
+        snapshot = dashboard.get_serializable_state(state)
+        assert snapshot['current_stage'] is None
+        assert snapshot['log_lines'] == ['new line']
+
+        dashboard.invalidate_state_cache(state)
+        assert dashboard.get_serializable_state(state)['current_stage'] == 'test'
+
+    def test_set_state_patches_snapshot_in_place(self):
+        """set_state() updates the cached snapshot without forcing a rebuild."""
+        state = dashboard.create_project_state()
+        snapshot = dashboard.get_serializable_state(state, include_logs=False)
+
+        dashboard.set_state(state, current_stage='review', current_cycle=3)
+        assert state['current_stage'] == 'review'
+        patched = dashboard.get_serializable_state(state, include_logs=False)
+        assert patched is snapshot
+        assert (patched['current_stage'], patched['current_cycle']) == ('review', 3)
+
+    def test_orphan_cleanup_scans_all_running_projects_once(self, monkeypatch):
+        """One scan covers every running project; kills are logged per project."""
+        running = dashboard.create_project_state()
+        running.update(running=True, project_path='/a')
+        idle = dashboard.create_project_state()
+        idle.update(project_path='/b')
+        monkeypatch.setattr(dashboard, 'projects_state', {'a': running, 'b': idle})
+        monkeypatch.setattr(dashboard, 'ORPHAN_CLEANUP_INTERVAL', 0)
+        monkeypatch.setattr(dashboard, 'orphan_cleanup_stop', dashboard.threading.Event())
+        scans = []
+
+        def fake_scan(paths):
+            scans.append(set(paths))
+            dashboard.orphan_cleanup_stop.set()
+            return {'/a': 2}
+
+        monkeypatch.setattr(dashboard.process_manager, 'detect_and_kill_orphans_in', fake_scan)
+        dashboard.cleanup_orphans()
+
+        assert scans == [{'/a'}]
+        assert 'Cleaned up 2 orphaned' in running['log_lines'][-1]
+
+    def test_projects_summary_cached_until_invalidated(self, monkeypatch):
+        """Connecting clients share one summary until a project changes."""
+        state = dashboard.create_project_state()
+        state.update(project_path='/p', current_cycle=1)
+        monkeypatch.setattr(dashboard, 'projects_state', {'p': state})
+        dashboard.invalidate_state_cache()
+
+        summary = dashboard.get_all_projects_summary()
+        assert dashboard.get_all_projects_summary() is summary
+
+        state['current_cycle'] = 2
+        dashboard.invalidate_state_cache(state)
+        assert dashboard.get_all_projects_summary()[0]['current_cycle'] == 2
+
+    def test_set_state_patches_project_summary_entry(self, monkeypatch):
+        """set_state() updates the cached summary entry without rebuilding the list."""
+        state = dashboard.create_project_state()
+        monkeypatch.setattr(dashboard, 'projects_state', {'p': state})
+        dashboard.invalidate_state_cache()
+        summary = dashboard.get_all_projects_summary()
+
+        dashboard.set_state(state, current_stage='test', tools_used=3)
+        assert dashboard.get_all_projects_summary() is summary
+        assert summary[0]['current_stage'] == 'test' and 'tools_used' not in summary[0]
+
+
+# =============================================================================
+# Output Parsing Tests
+# =============================================================================
+
+class TestStageRegex:
+    """Tests for the combined stage/cycle marker pattern."""
+
+    def test_markers_from_orchestra_output(self):
+        """Each kind of marker is reported through lastindex."""
+        def parse(line):
+            m = dashboard._STAGE_RE.search(line)
+            return (m.lastindex, m.group(m.lastindex)) if m else None
+
+        assert parse('[STAGE 3] Running Reviewer Agent (iteration 1/3)...') == (1, '3')
+        assert parse('STAGE 2: TESTER') == (2, 'TESTER')
+        assert parse('Running planner agent') == (2, 'planner')
+        assert parse('CYCLE 4/1000') == (3, '4')
+        assert parse('Cycle complete: 3/4 stages succeeded')[0] == 4
+        assert parse('[STAGE 3.1] Running Fixer Agent...') is None
+        assert parse('plain output line') is None
+
+
+class TestRateLimit:
+    """Tests for rate limit detection in output lines."""
+
+    def test_wait_time_extracted(self, monkeypatch):
+        """Matching lines report the wait in seconds; other lines report None."""
+        monkeypatch.setattr(dashboard, 'usage_stats', dict(dashboard.usage_stats))
+        assert dashboard.check_rate_limit('Rate-Limit hit, try again in 2 Minutes') == 120
+        assert dashboard.check_rate_limit('HTTP 429 Too Many Requests') == 60
+        assert dashboard.check_rate_limit('Running tests') is None
+
+
+# =============================================================================
+# Recent Projects Tests
+# =============================================================================
+
+class TestRecentProjects:
+    """Tests for the recent projects list."""
+
+    @pytest.fixture(autouse=True)
+    def recent_file(self, tmp_path, monkeypatch):
+        """Point the recent projects file at a temp location with a cold cache."""
+        path = tmp_path / "recent.json"
+        monkeypatch.setattr(dashboard, 'RECENT_PROJECTS_FILE', str(path))
+        monkeypatch.setattr(dashboard, '_recent_projects_cache', None)
+        return path
+
+    def test_save_moves_to_front_and_persists(self, recent_file):
+        """Re-saving a project moves it to the front and the file matches memory."""
+        dashboard.save_recent_project('/a')
+        dashboard.save_recent_project('/b')
+        assert dashboard.save_recent_project('/a') == ['/a', '/b']
+        assert json.loads(recent_file.read_text()) == ['/a', '/b']
+        assert not Path(str(recent_file) + '.tmp').exists()
+
+    def test_load_served_from_memory(self, recent_file):
+        """After the first read, the file is not consulted again."""
+        recent_file.write_text('["/x"]')
+        assert dashboard.load_recent_projects() == ['/x']
+        recent_file.write_text('["/y"]')
+        assert dashboard.load_recent_projects() == ['/x']
+
+
+# =============================================================================
+# Safeguard Tests
+# =============================================================================
+
+class TestSafeguards:
+    """Tests for the per-line safeguard checks."""
+
+    def test_cross_repo_prefilter(self, monkeypatch):
+        """Lines naming no other known repo are skipped; mentions still alert."""
+        monkeypatch.setitem(dashboard.safeguards, 'known_repos', ['/repos/current', '/repos/other'])
+        monkeypatch.setattr(dashboard, '_cross_repo_patterns_cache', {})
+
+        assert not dashboard.check_cross_repo_activity('Running tests', '/repos/current', 'p')
+        assert not dashboard.check_cross_repo_activity('cd /repos/current', '/repos/current', 'p')
+        assert dashboard.check_cross_repo_activity('Working in Other now', '/repos/current', 'p')
+
+    def test_path_traversal_fast_path(self):
+        """Plain paths under the project pass; '..' escapes are still caught."""
+        assert not dashboard.check_path_traversal('/proj/src/a.py', '/proj', 'p')
+        assert dashboard.check_path_traversal('/proj/../etc/passwd', '/proj', 'p')
+        assert dashboard.check_path_traversal('/proj2/a.py', '/proj', 'p')
+
+    def test_path_traversal_through_symlink(self, tmp_path):
+        """A symlinked directory inside the project that points outside it is still caught."""
+        project = tmp_path / "proj"
+        (project / "src").mkdir(parents=True)
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        (project / "link").symlink_to(outside)
+
+        assert not dashboard.check_path_traversal(str(project / "src" / "a.py"), str(project), 'p')
+        assert dashboard.check_path_traversal(str(project / "link" / "x.py"), str(project), 'p')